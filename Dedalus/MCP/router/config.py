@@ -31,6 +31,7 @@ class RouterConfig:
 
     # --- Metrics ---
     metrics_file: Path = field(default_factory=lambda: Path("data/usage_metrics.jsonl"))
+    metrics_flush_turns: int = 10  # Write usage in the background every N tool-using turns
 
     # --- MCP Registry ---
     registry: List[Dict] = field(default_factory=list)
@@ -9,15 +9,19 @@ Flow per turn:
   1. Build messages from conversation history + new user input.
   2. Execute with cached MCP servers + ``discover_tools`` always available.
   3. If ``discover_tools`` was called → add new servers to LRU → re-run
-     with expanded server set.
+     with expanded server set, continuing from the first run's transcript.
   4. Post-run: touch used servers in LRU, mark failures, record metrics,
      update conversation history.
 """
 
 from __future__ import annotations
 
+import asyncio
+import math
+import re
 import sys
-from typing import AsyncIterator, Dict, List
+from collections import OrderedDict
+from typing import AsyncIterator, Callable, Dict, List
 
 from .config import RouterConfig
 from .health import HealthTracker
@@ -70,6 +74,91 @@ REQUIRED ACTIONS:
 YOU ARE NOT AN ASSISTANT. YOU ARE A TOOL ROUTER. ACT ACCORDINGLY.\
 """
 
+# Split once so building instructions is a plain concatenation, not a format pass
+_INSTRUCTIONS_PREFIX, _INSTRUCTIONS_SUFFIX = _AGENT_INSTRUCTIONS.split("{cache_status}", 1)
+
+# Distinct active-server sets are few; bound the memo anyway
+_INSTRUCTIONS_CACHE_SIZE = 128
+
+_NO_RESPONSE = "No response generated"
+
+
+# ---------------------------------------------------------------------------
+# Capability routing
+# ---------------------------------------------------------------------------
+
+# One bit per capability; lower bits win when several are missing.
+_CAP_URL = 1
+_CAP_WEATHER = 2
+_CAP_STOCK = 4
+_CAP_SOCIAL = 8
+_CAP_NEWS = 16
+
+_QUERY_KEYWORDS: Dict[int, List[str]] = {
+    _CAP_URL: ["http://", "https://", ".com", ".org"],
+    _CAP_WEATHER: ["weather", "temperature", "forecast", "rain", "snow", "climate"],
+    _CAP_STOCK: ["stock", "share", "ticker", "market", "equity", "msft", "aapl", "nasdaq"],
+    _CAP_SOCIAL: ["tweet", "twitter", "x.com", "elon", "musk", "social"],
+    _CAP_NEWS: ["news", "headlines", "breaking"],
+}
+
+_SERVER_KEYWORDS: Dict[int, List[str]] = {
+    _CAP_URL: ["fetch", "scrape", "http"],
+    _CAP_WEATHER: ["weather", "meteo"],
+    _CAP_STOCK: ["finance", "stock", "yahoo"],
+    _CAP_SOCIAL: ["twitter", "x-api"],
+    _CAP_NEWS: ["news"],
+}
+
+_DISCOVERY_QUERIES: Dict[int, List[str]] = {
+    _CAP_URL: ["web fetch", "HTTP", "scraping"],
+    _CAP_WEATHER: ["weather", "forecast", "conditions"],
+    _CAP_STOCK: ["stock", "financial", "market data"],
+    _CAP_SOCIAL: ["twitter", "X", "social media"],
+    _CAP_NEWS: ["news", "headlines", "current events"],
+}
+
+_DISCOVERY_REASONS: Dict[int, str] = {
+    _CAP_URL: "  [Query contains URL, but no web fetch server - auto-discovering]",
+    _CAP_WEATHER: "  [Query needs weather, but no weather server - auto-discovering]",
+    _CAP_STOCK: "  [Query needs stocks, but no stock server - auto-discovering]",
+    _CAP_SOCIAL: "  [Query needs social media, but no social server - auto-discovering]",
+    _CAP_NEWS: "  [Query needs news, but no news server - auto-discovering]",
+}
+
+
+def _compile_keyword_scanner(table: Dict[int, List[str]]) -> Callable[[str], int]:
+    """Compile a keyword table into a single-pass ``text -> capability mask`` scanner.
+
+    The lookahead alternation reports the longest keyword starting at every
+    position, so each keyword also carries the bits of any keyword it
+    contains (``x.com`` flags both social and URL).
+    """
+    bits: Dict[str, int] = {}
+    for cap, words in table.items():
+        for word in words:
+            bits[word] = bits.get(word, 0) | cap
+    own = dict(bits)
+    for word in bits:
+        for other, other_bits in own.items():
+            if other in word:
+                bits[word] |= other_bits
+
+    alternation = "|".join(re.escape(w) for w in sorted(bits, key=len, reverse=True))
+    finditer = re.compile(f"(?=({alternation}))").finditer
+
+    def scan(text: str) -> int:
+        mask = 0
+        for match in finditer(text):
+            mask |= bits[match.group(1)]
+        return mask
+
+    return scan
+
+
+_scan_query = _compile_keyword_scanner(_QUERY_KEYWORDS)
+_scan_server = _compile_keyword_scanner(_SERVER_KEYWORDS)
+
 
 class SmartRouter:
     """Provider-agnostic agent router with LRU tool caching."""
@@ -93,40 +182,131 @@ class SmartRouter:
             relative_score_cutoff=config.relative_score_cutoff,
             debug=config.debug,
         )
-        self._cache = ToolCache(max_size=config.max_cache_size)
+        self._cache = ToolCache(max_size=config.max_cache_size, value_fn=self._server_value)
         self._health = HealthTracker(cooldown_seconds=config.health_cooldown_seconds)
         self._metrics = UsageMetrics(metrics_file=config.metrics_file)
         self._history = ConversationHistory(max_turns=config.max_history_turns)
         
         # Track tool discoveries (set per turn)
         self._newly_discovered: List[str] = []
+
+        # url -> capability mask, computed from the lowercased URL once up front
+        # (cached servers always come from the registry)
+        self._url_caps: Dict[str, int] = {
+            entry["url"]: _scan_server(entry["url"].lower()) for entry in config.registry
+        }
+
+        # url -> "  - url: description (covers: ...)" line for the instructions
+        self._server_info: Dict[str, str] = {}
+        for entry in config.registry:
+            url = entry["url"]
+            if url in self._server_info:
+                continue  # first registry entry wins, as before
+            desc = entry.get('description', 'Unknown')
+            keywords = entry.get('keywords', [])
+            kw_str = f" (covers: {', '.join(keywords[:5])})" if keywords else ""
+            self._server_info[url] = f"  - {url}: {desc}{kw_str}"
+        self._instructions_cache: OrderedDict[frozenset, str] = OrderedDict()
+
+        # Background metrics flush (see _schedule_metrics_flush)
+        self._flush_task: asyncio.Task | None = None
+        self._turns_since_flush = 0
+
+        # Built once so every run hands the runner the same tool object
+        self._discover_tools = self._make_discover_tools_tool()
     
-    def _log(self, msg: str) -> None:
-        """Print debug message to stderr if debug mode is enabled."""
+    def _log(self, fmt: str, *args) -> None:
+        """Print debug message to stderr if debug mode is enabled.
+
+        ``fmt`` is %-formatted with ``args`` only when debug is on, so
+        callers can pass large objects without paying for their repr.
+        """
         if self._config.debug:
-            print(msg, file=sys.stderr, flush=True)
+            print(fmt % args if args else fmt, file=sys.stderr, flush=True)
     
+    def _server_value(self, url: str) -> float:
+        """Eviction value of a cached server: usage frequency plus current health."""
+        healthy = 1.0 if self._health.is_healthy(url) else 0.0
+        return math.log(self._metrics.usage_count(url) + healthy + 1e-3)
+
+    def _server_caps(self, url: str) -> int:
+        """Capability mask a server URL provides (computed lazily if unregistered)."""
+        caps = self._url_caps.get(url)
+        if caps is None:
+            caps = self._url_caps[url] = _scan_server(url.lower())
+        return caps
+
     # ------------------------------------------------------------------
     # Tool Discovery
     # ------------------------------------------------------------------
     
     def _discover_tools_impl(self, queries: List[str]) -> str:
         """Internal implementation of discover_tools."""
-        self._log(f"  [🔍 discover_tools called with queries: {queries}]")
+        self._log("  [🔍 discover_tools called with queries: %s]", queries)
         results = self._registry.search(queries)
-        self._log(f"  [🔍 Found {len(results)} matching tools]")
+        self._log("  [🔍 Found %d matching tools]", len(results))
         for r in results:
             url = r["url"]
             if self._health.is_healthy(url) and url not in self._newly_discovered:
                 self._newly_discovered.append(url)
                 evicted = self._cache.add(url)
                 if evicted:
-                    self._log(f"  [Cache evicted: {evicted}]")
+                    self._log("  [Cache evicted: %s]", evicted)
         if results:
             descs = [f"- {r['description']} (score: {r['score']})" for r in results]
             return "Found these capabilities:\n" + "\n".join(descs)
         return "No matching tools found for those queries."
     
+    def _maybe_auto_discover(self, user_input: str, active_urls: List[str]) -> List[str]:
+        """Discover servers up front when the query obviously needs a missing capability.
+
+        Returns the (possibly refreshed) healthy active URLs. Any servers
+        found are recorded in ``self._newly_discovered``.
+        """
+        needed = _scan_query(user_input.lower())
+        have = 0
+        for url in active_urls:
+            have |= self._server_caps(url)
+        missing = needed & ~have
+
+        if not missing:
+            if not active_urls:
+                self._log(f"  [No servers available - auto-discovering based on query]")
+            return active_urls
+
+        # Lowest bit first keeps the URL > weather > stock > social > news priority
+        cap = missing & -missing
+        discovery_queries = _DISCOVERY_QUERIES[cap]
+        self._log(_DISCOVERY_REASONS[cap])
+        self._discover_tools_impl(discovery_queries)
+        if self._config.debug:
+            self._log(f"  [Auto-discovered tools for: {', '.join(discovery_queries)}]")
+        # Refresh active URLs after auto-discovery
+        return self._health.filter_healthy(self._cache.get_urls())
+
+    def _make_discover_tools_tool(self) -> Callable[[List[str]], str]:
+        """Build the ``discover_tools`` function exposed to the agent."""
+        router = self
+
+        def discover_tools(queries: list[str]) -> str:
+            """MANDATORY: Call this IMMEDIATELY if you don't have a server for the user's request!
+            
+            Example: User asks "weather in Seattle" but you only have [stock, fetch] servers?
+            → Call discover_tools(["weather", "forecast"]) RIGHT NOW!
+            
+            This searches for MCP servers that provide the capabilities in your queries.
+            Use 2-3 related search terms per capability.
+            
+            Examples:
+            - discover_tools(["weather", "forecast", "conditions"])
+            - discover_tools(["stock market", "financial data"])
+            - discover_tools(["twitter", "X", "social media"])
+            
+            DO NOT skip calling this! If you need weather and don't have weather, CALL THIS!"""
+            return router._discover_tools_impl(queries)
+
+        return discover_tools
+
     def _select_best_server(self, user_query: str, cached_urls: List[str]) -> List[str]:
         """Select the most relevant server from cache for this query.
         
@@ -139,17 +319,22 @@ class SmartRouter:
             return cached_urls
         
         # Search registry to find which cached server best matches the query
-        self._log(f"  [Selecting best server from cache for query: '{user_query[:50]}...']")
+        self._log("  [Selecting best server from cache for query: '%.50s...']", user_query)
         results = self._registry.search([user_query])
         
-        # Find first result that's in our cache
-        for r in results:
-            if r["url"] in cached_urls:
-                self._log(f"  [Best match from cache: {r['url']} (score: {r['score']})]")
-                return [r["url"]]
+        # Highest-scoring result that's in our cache (results are not score-ordered)
+        cached_set = set(cached_urls)
+        best = max(
+            (r for r in results if r["url"] in cached_set),
+            key=lambda r: r["score"],
+            default=None,
+        )
+        if best is not None:
+            self._log("  [Best match from cache: %s (score: %s)]", best["url"], best["score"])
+            return [best["url"]]
         
         # No semantic match, use most recent
-        self._log(f"  [No semantic match, using most recent: {cached_urls[-1]}]")
+        self._log("  [No semantic match, using most recent: %s]", cached_urls[-1])
         return [cached_urls[-1]]
     
     # ------------------------------------------------------------------
@@ -159,22 +344,29 @@ class SmartRouter:
     async def initialize(self) -> None:
         """Startup: cache embeddings + preload popular tools."""
         print("Caching registry embeddings...")
-        count = self._registry.cache_embeddings()
+        # Registry embedding, seed-query embedding and the metrics log scan
+        # are independent and I/O-bound, so run them side by side
+        seeds = [q for queries in _DISCOVERY_QUERIES.values() for q in queries]
+        count, top, _ = await asyncio.gather(
+            self._registry.cache_embeddings(),
+            asyncio.to_thread(self._metrics.get_top_tools, self._config.preload_count),
+            asyncio.to_thread(self._registry.warm_queries, seeds if self._config.registry else []),
+        )
         print(f"Cached embeddings for {count} tool(s).")
 
         # Preload from historical usage
-        top = self._metrics.get_top_tools(self._config.preload_count)
         if top:
             # Only preload tools still in the registry
-            registry_urls = {t["url"] for t in self._config.registry}
-            to_preload = [u for u in top if u in registry_urls]
+            to_preload = [u for u in top if u in self._server_info]
             self._cache.preload(to_preload)
             if to_preload:
                 print(f"Preloaded {len(to_preload)} tool(s) from usage history: {', '.join(to_preload)}")
 
-    def shutdown(self) -> None:
+    async def shutdown(self) -> None:
         """Flush metrics on exit."""
-        self._metrics.flush_session()
+        if self._flush_task is not None:
+            await self._flush_task
+        await self._metrics.flush()
 
     # ------------------------------------------------------------------
     # Turn handling
@@ -186,26 +378,7 @@ class SmartRouter:
         # Track discoveries at instance level to avoid closure issues
         self._newly_discovered: List[str] = []
 
-        # --- discover_tools as instance method reference ---
-        def discover_tools(queries: list[str]) -> str:
-            """MANDATORY: Call this IMMEDIATELY if you don't have a server for the user's request!
-            
-            Example: User asks "weather in Seattle" but you only have [stock, fetch] servers?
-            → Call discover_tools(["weather", "forecast"]) RIGHT NOW!
-            
-            This searches for MCP servers that provide the capabilities in your queries.
-            Use 2-3 related search terms per capability.
-            
-            Examples:
-            - discover_tools(["weather", "forecast", "conditions"])
-            - discover_tools(["stock market", "financial data"])
-            - discover_tools(["twitter", "X", "social media"])
-            
-            DO NOT skip calling this! If you need weather and don't have weather, CALL THIS!"""
-            return self._discover_tools_impl(queries)
-        
-        # Set the function name for Dedalus serialization
-        discover_tools.__name__ = "discover_tools"
+        discover_tools = self._discover_tools
 
         # Build messages
         messages = self._history.append_user(user_input)
@@ -215,71 +388,22 @@ class SmartRouter:
         active_urls = self._health.filter_healthy(cached_urls)
         
         if cached_urls and not active_urls:
-            self._log(f"  [All {len(cached_urls)} cached servers are unhealthy - starting fresh]")
+            self._log("  [All %d cached servers are unhealthy - starting fresh]", len(cached_urls))
         
         # WORKAROUND: Auto-discover if no servers OR query needs different capability
-        query_lower = user_input.lower()
-        needs_discovery = False
-        discovery_queries = []
-        
-        # Check what the query is about
-        is_url = 'http://' in query_lower or 'https://' in query_lower or '.com' in query_lower or '.org' in query_lower
-        is_weather = any(word in query_lower for word in ['weather', 'temperature', 'forecast', 'rain', 'snow', 'climate'])
-        is_stock = any(word in query_lower for word in ['stock', 'share', 'ticker', 'market', 'equity', 'msft', 'aapl', 'nasdaq'])
-        is_social = any(word in query_lower for word in ['tweet', 'twitter', 'x.com', 'elon', 'musk', 'social'])
-        is_news = any(word in query_lower for word in ['news', 'headlines', 'breaking'])
-        
-        # Check if we have the right server
-        if is_url and not any('fetch' in url.lower() or 'scrape' in url.lower() or 'http' in url.lower() for url in active_urls):
-            needs_discovery = True
-            discovery_queries = ["web fetch", "HTTP", "scraping"]
-            self._log(f"  [Query contains URL, but no web fetch server - auto-discovering]")
-        elif is_weather and not any('weather' in url.lower() or 'meteo' in url.lower() for url in active_urls):
-            needs_discovery = True
-            discovery_queries = ["weather", "forecast", "conditions"]
-            self._log(f"  [Query needs weather, but no weather server - auto-discovering]")
-        elif is_stock and not any('finance' in url.lower() or 'stock' in url.lower() or 'yahoo' in url.lower() for url in active_urls):
-            needs_discovery = True
-            discovery_queries = ["stock", "financial", "market data"]
-            self._log(f"  [Query needs stocks, but no stock server - auto-discovering]")
-        elif is_social and not any('twitter' in url.lower() or 'x-api' in url.lower() for url in active_urls):
-            needs_discovery = True
-            discovery_queries = ["twitter", "X", "social media"]
-            self._log(f"  [Query needs social media, but no social server - auto-discovering]")
-        elif is_news and not any('news' in url.lower() for url in active_urls):
-            needs_discovery = True
-            discovery_queries = ["news", "headlines", "current events"]
-            self._log(f"  [Query needs news, but no news server - auto-discovering]")
-        elif not active_urls:
-            # Fallback: No servers at all
-            needs_discovery = True
-            self._log(f"  [No servers available - auto-discovering based on query]")
-            if is_url:
-                discovery_queries = ["web fetch", "HTTP", "scraping"]
-            elif is_weather:
-                discovery_queries = ["weather", "forecast", "conditions"]
-            elif is_stock:
-                discovery_queries = ["stock", "financial", "market data"]
-            elif is_social:
-                discovery_queries = ["twitter", "X", "social media"]
-        
-        # Execute auto-discovery if needed
-        if needs_discovery and discovery_queries:
-            auto_result = self._discover_tools_impl(discovery_queries)
-            self._log(f"  [Auto-discovered tools for: {', '.join(discovery_queries)}]")
-            # Refresh active URLs after auto-discovery
-            active_urls = self._health.filter_healthy(self._cache.get_urls())
+        active_urls = self._maybe_auto_discover(user_input, active_urls)
         
         # The agent can see all servers in instructions and will intelligently choose the right one
         instructions = self._build_instructions(active_urls)
 
         # --- Execution run ---
-        self._log(f"  [Running with {len(active_urls) if active_urls else 0} MCP servers, max_steps={self._config.max_steps}]")
-        if active_urls:
-            self._log(f"  [Active servers: {', '.join(active_urls)}]")
-        self._log(f"  [Tools available to agent: discover_tools]")
-        self._log(f"  [DEBUG: model={self._config.execution_model}, tools={[t.__name__ for t in [discover_tools]]}, mcp_servers={active_urls if active_urls else None}]")
-        self._log(f"  [DEBUG: messages count={len(messages)}, instructions length={len(instructions)} chars]")
+        if self._config.debug:
+            self._log(f"  [Running with {len(active_urls) if active_urls else 0} MCP servers, max_steps={self._config.max_steps}]")
+            if active_urls:
+                self._log(f"  [Active servers: {', '.join(active_urls)}]")
+            self._log(f"  [Tools available to agent: discover_tools]")
+            self._log(f"  [DEBUG: model={self._config.execution_model}, tools={[t.__name__ for t in [discover_tools]]}, mcp_servers={active_urls if active_urls else None}]")
+            self._log(f"  [DEBUG: messages count={len(messages)}, instructions length={len(instructions)} chars]")
         
         try:
             result = await self._agent.run(
@@ -290,7 +414,7 @@ class SmartRouter:
                 instructions=instructions,
                 max_steps=self._config.max_steps,
             )
-            self._log(f"  [Execution completed: steps_used={result.steps_used if hasattr(result, 'steps_used') else 'unknown'}]")
+            self._log("  [Execution completed: steps_used=%s]", getattr(result, "steps_used", "unknown"))
             
             # Log if discover_tools was called this run
             if not self._newly_discovered and active_urls:
@@ -299,175 +423,185 @@ class SmartRouter:
         except Exception as e:
             # Only evict newly auto-discovered servers (they're the likely culprits)
             # Keep previously working servers in cache
-            self._log(f"  [❌ Execution error: {e}]")
+            self._log("  [❌ Execution error: %s]", e)
             if self._newly_discovered:
-                self._log(f"  [Marking {len(self._newly_discovered)} newly discovered servers as unhealthy]")
-                for url in self._newly_discovered:
-                    self._health.mark_unhealthy(url)
-                    self._cache.evict(url)
+                self._log("  [Marking %d newly discovered servers as unhealthy]", len(self._newly_discovered))
+                self._quarantine(self._newly_discovered)
             else:
                 # No new discoveries - mark all as potentially unhealthy
                 if active_urls:
-                    self._log(f"  [Marking all {len(active_urls)} active servers as unhealthy due to error]")
-                    for url in active_urls:
-                        self._health.mark_unhealthy(url)
-                        self._cache.evict(url)
-            # Rollback the failed user query to prevent contamination
-            self._log(f"  [Rolling back failed user query from history]")
-            self._history.rollback_last_user()
+                    self._log("  [Marking all %d active servers as unhealthy due to error]", len(active_urls))
+                self._quarantine(active_urls)
             raise
 
         # --- Check if discovery happened → re-run with new servers ---
         if self._newly_discovered:
-            self._log(f"  [Discovered {len(self._newly_discovered)} new tool(s): {', '.join(self._newly_discovered)}]")
+            if self._config.debug:
+                self._log(f"  [Discovered {len(self._newly_discovered)} new tool(s): {', '.join(self._newly_discovered)}]")
+            probe_result, probe_urls = result, active_urls
             # Rebuild with ALL healthy cached servers - agent will choose the right one
             active_urls = self._health.filter_healthy(self._cache.get_urls())
-            self._log(f"  [Re-running with {len(active_urls)} active servers: {active_urls}]")
+            self._log("  [Re-running with %d active servers: %s]", len(active_urls), active_urls)
             instructions = self._build_instructions(active_urls)
+            self._record_probe_usage(probe_result, probe_urls, active_urls)
             
             try:
-                self._log(f"  [Calling runner.run with mcp_servers={active_urls}]")
+                self._log("  [Calling runner.run with mcp_servers=%s]", active_urls)
                 result = await self._agent.run(
-                    messages=messages,  # original messages, not first run's output
+                    # Continue from the probe's discover_tools observation
+                    messages=self._continuation(probe_result, messages),
                     model=self._config.execution_model,
                     tools=[discover_tools],
                     mcp_servers=active_urls if active_urls else None,
                     instructions=instructions,
-                    max_steps=self._config.max_steps,
+                    max_steps=self._remaining_steps(probe_result),
                 )
                 self._log(f"  [Re-run completed successfully]")
             except Exception as e:
-                self._log(f"  [❌ Re-run error during execution: {type(e).__name__}: {e}]")
+                self._log("  [❌ Re-run error during execution: %s: %s]", type(e).__name__, e)
                 # The error might be from a specific server - mark all as unhealthy for now
-                for url in self._newly_discovered:
-                    self._log(f"  [Marking {url} as unhealthy due to re-run failure]")
-                    self._health.mark_unhealthy(url)
-                    self._cache.evict(url)
-                # Rollback the failed user query to prevent contamination
-                self._log(f"  [Rolling back failed user query from history]")
-                self._history.rollback_last_user()
+                if self._config.debug:
+                    self._log(f"  [Marking {', '.join(self._newly_discovered)} as unhealthy due to re-run failure]")
+                self._quarantine(self._newly_discovered)
                 raise
 
         # Check for handoff messages BEFORE post-run processing
         # This indicates the MCP server didn't respond properly
         if hasattr(result, 'final_output'):
             output = result.final_output
-            self._log(f"  [final_output type: {type(output)}]")
+            self._log("  [final_output type: %s]", type(output))
             
             if isinstance(output, str) and '__DEDALUS_HANDOFF__' in output:
                 self._log(f"  [⚠️  WARNING: Got raw handoff message - MCP tool execution failed]")
                 self._log(f"  [Marking newly discovered servers as unhealthy and rolling back]")
                 # Mark newly discovered servers as unhealthy (they're the ones that failed)
-                for url in self._newly_discovered:
-                    self._health.mark_unhealthy(url)
-                    self._cache.evict(url)
-                # Rollback the failed query
-                self._history.rollback_last_user()
+                self._quarantine(self._newly_discovered)
                 return "The tool server didn't respond properly. The server may be experiencing issues or requires authentication."
 
         # --- Post-run processing ---
         self._post_run(result, active_urls)
 
         # Debug: log result attributes
-        self._log(f"  [Result attributes: {dir(result)}]")
-        
-        # Extract final output
-        if hasattr(result, 'final_output'):
-            output = result.final_output
-            
-            # Check if output is a dict (assistant message)
-            if isinstance(output, dict):
-                if 'content' in output:
-                    content = output['content']
-                    if isinstance(content, str) and '__DEDALUS_HANDOFF__' not in content:
-                        return content
-                return str(output)
-            
-            return output
-        
-        # Fallback: try to get from messages
-        if hasattr(result, 'messages') and result.messages:
-            self._log(f"  [Trying to extract from messages]")
-            last_msg = result.messages[-1]
-            if isinstance(last_msg, dict) and last_msg.get('role') == 'assistant':
-                return last_msg.get('content', str(last_msg))
-        
-        return "No response generated"
+        if self._config.debug:
+            self._log("  [Result attributes: %s]", dir(result))
+
+        return self._extract_output(result)
 
     async def handle_turn_stream(self, user_input: str) -> AsyncIterator[str]:
         """Process a turn with streaming output.
 
-        If discovery is triggered, the discovery run is non-streaming.
-        Only the final execution run is streamed.
+        If the routing rules auto-discover servers, the first run is streamed
+        directly. Otherwise a non-streaming probe run may trigger discovery,
+        and only the final execution run is streamed.
         """
         # Reset discoveries for this turn
         self._newly_discovered: List[str] = []
 
-        def discover_tools(queries: list[str]) -> str:
-            """MANDATORY: Call this IMMEDIATELY if you don't have a server for the user's request!
-            
-            Example: User asks "weather in Seattle" but you only have [stock, fetch] servers?
-            → Call discover_tools(["weather", "forecast"]) RIGHT NOW!
-            
-            This searches for MCP servers that provide the capabilities in your queries.
-            Use 2-3 related search terms per capability.
-            
-            Examples:
-            - discover_tools(["weather", "forecast", "conditions"])
-            - discover_tools(["stock market", "financial data"])
-            - discover_tools(["twitter", "X", "social media"])
-            
-            DO NOT skip calling this! If you need weather and don't have weather, CALL THIS!"""
-            return self._discover_tools_impl(queries)
-        
-        discover_tools.__name__ = "discover_tools"
+        discover_tools = self._discover_tools
 
         messages = self._history.append_user(user_input)
         active_urls = self._health.filter_healthy(self._cache.get_urls())
-        instructions = self._build_instructions(active_urls)
-
-        # Probe run (non-streaming) — may trigger discovery
-        result = await self._agent.run(
-            messages=messages,
-            model=self._config.execution_model,
-            tools=[discover_tools],
-            mcp_servers=active_urls if active_urls else None,
-            instructions=instructions,
-            max_steps=self._config.max_steps,
-        )
+        active_urls = self._maybe_auto_discover(user_input, active_urls)
 
         if self._newly_discovered:
-            self._log(f"  [Discovered {len(self._newly_discovered)} new tool(s): {', '.join(self._newly_discovered)}]")
-            active_urls = self._health.filter_healthy(self._cache.get_urls())
+            # Routing rules already picked the servers — no probe run needed
+            probe_messages = messages
+            max_steps = self._config.max_steps
+        else:
+            # Probe run (non-streaming) — may trigger discovery
             instructions = self._build_instructions(active_urls)
-            # Stream the re-run with original messages
-            collected: List[str] = []
-            async for chunk in self._agent.run_stream(
-                messages=messages,  # original messages, not first run's output
+            result = await self._agent.run(
+                messages=messages,
                 model=self._config.execution_model,
                 tools=[discover_tools],
                 mcp_servers=active_urls if active_urls else None,
                 instructions=instructions,
                 max_steps=self._config.max_steps,
-            ):
-                collected.append(chunk)
-                yield chunk
-
-            # Update history from collected output
-            # (streaming doesn't return a RunResult, so we reconstruct minimally)
-            full_output = "".join(collected)
-            self._history.update(
-                result.messages + [{"role": "assistant", "content": full_output}]
             )
-        else:
-            # No discovery — just yield the full result
-            yield result.final_output
-            self._post_run(result, active_urls)
+            if not self._newly_discovered:
+                # No discovery — just yield the full result
+                yield result.final_output
+                self._post_run(result, active_urls)
+                return
+            probe_messages = self._continuation(result, messages)
+            max_steps = self._remaining_steps(result)
+
+        if self._config.debug:
+            self._log(f"  [Discovered {len(self._newly_discovered)} new tool(s): {', '.join(self._newly_discovered)}]")
+        active_urls = self._health.filter_healthy(self._cache.get_urls())
+        instructions = self._build_instructions(active_urls)
+        # Stream the re-run, continuing from the probe's transcript
+        collected: List[str] = []
+        async for chunk in self._agent.run_stream(
+            messages=probe_messages,
+            model=self._config.execution_model,
+            tools=[discover_tools],
+            mcp_servers=active_urls if active_urls else None,
+            instructions=instructions,
+            max_steps=max_steps,
+        ):
+            collected.append(chunk)
+            yield chunk
+
+        # Update history from collected output
+        # (streaming doesn't return a RunResult, so we reconstruct minimally)
+        full_output = "".join(collected)
+        self._history.update(
+            probe_messages + [{"role": "assistant", "content": full_output}]
+        )
 
     # ------------------------------------------------------------------
     # Internals
     # ------------------------------------------------------------------
 
+    def _continuation(self, probe_result, messages: List[Dict]) -> List[Dict]:
+        """Messages for the re-run after discovery.
+
+        The probe run's transcript (its ``discover_tools`` call and result
+        included) is kept, so the re-run shares the probe's prefix and only
+        the new steps are prefilled. The probe's closing reply, written
+        before the new servers were attached, is dropped. Falls back to
+        ``messages`` if the result carries no transcript.
+        """
+        transcript = getattr(probe_result, "messages", None)
+        if not transcript or len(transcript) <= len(messages):
+            return messages
+        tail = transcript[-1]
+        if isinstance(tail, dict) and tail.get("role") == "assistant" and not tail.get("tool_calls"):
+            transcript = transcript[:-1]
+        return transcript
+
+    def _remaining_steps(self, probe_result) -> int:
+        """Step budget left for the re-run after the probe run."""
+        used = getattr(probe_result, "steps_used", None) or 0
+        return max(1, self._config.max_steps - used)
+
+    def _quarantine(self, urls: List[str]) -> None:
+        """Mark servers unhealthy, drop them from the cache, and roll back the turn.
+
+        Rolling back the failed user query keeps it from contaminating
+        future turns.
+        """
+        self._health.mark_unhealthy_many(urls)
+        self._cache.evict_many(urls)
+        self._log(f"  [Rolling back failed user query from history]")
+        self._history.rollback_last_user()
+
+    def _record_probe_usage(self, result, probe_urls: List[str], rerun_urls: List[str]) -> None:
+        """Touch and record servers the superseded probe run used successfully.
+
+        Only the re-run's result reaches ``_post_run``, which credits the
+        re-run's servers; this credits the probe's servers that are not among
+        them, so no server is counted twice for one turn.
+        """
+        if not result.mcp_results or any(mr.is_error for mr in result.mcp_results):
+            return
+        rerun = set(rerun_urls)
+        dropped = [url for url in probe_urls if url not in rerun]
+        if dropped:
+            self._cache.touch_many(dropped)
+            self._metrics.record_tool_use_many(dropped)
+
     def _post_run(self, result, active_urls: List[str]) -> None:
         """LRU touch, health tracking, metrics, history update."""
         # Check if any MCP tools returned errors
@@ -475,54 +609,94 @@ class SmartRouter:
         if result.mcp_results:
             for mr in result.mcp_results:
                 if mr.is_error:
-                    self._log(f"  [MCP tool error: {mr.tool_name} - {mr.error if hasattr(mr, 'error') else 'unknown error'}]")
+                    self._log("  [MCP tool error: %s - %s]", mr.tool_name, getattr(mr, "error", "unknown error"))
                     has_server_error = True
 
         # If tools were executed successfully, touch all active servers
         # (we don't know which specific server each tool came from)
         if not has_server_error and result.mcp_results:
-            for url in active_urls:
-                self._cache.touch(url)
-                self._metrics.record_tool_use(url)
-                self._log(f"  [✓ Server {url} used successfully]")
+            self._cache.touch_many(active_urls)
+            self._metrics.record_tool_use_many(active_urls)
+            if self._config.debug:
+                for url in active_urls:
+                    self._log(f"  [✓ Server {url} used successfully]")
+            self._schedule_metrics_flush()
 
         # Update conversation history - but filter out server errors
         # to prevent poisoning future discovery attempts
         if has_server_error:
             # Don't add the failed attempt to history, mark all active servers as unhealthy
             self._log(f"  [Skipping history update due to MCP tool error]")
-            for url in active_urls:
-                self._log(f"  [Marking {url} as unhealthy due to tool error]")
-                self._health.mark_unhealthy(url)
-                self._cache.evict(url)
+            if self._config.debug:
+                self._log(f"  [Marking {', '.join(active_urls)} as unhealthy due to tool error]")
             # CRITICAL: Rollback the user's question from history since we can't answer it
-            self._log(f"  [Rolling back failed user query from history to prevent contamination]")
-            self._history.rollback_last_user()
+            self._quarantine(active_urls)
         else:
             self._history.update(result.messages)
 
+    def _schedule_metrics_flush(self) -> None:
+        """Flush usage metrics in the background every ``metrics_flush_turns`` turns."""
+        self._turns_since_flush += 1
+        if self._turns_since_flush < self._config.metrics_flush_turns:
+            return
+        if self._flush_task is not None and not self._flush_task.done():
+            return  # previous write still running; catch up next turn
+        self._turns_since_flush = 0
+        self._flush_task = asyncio.create_task(self._metrics.flush())
+
+    def _extract_output(self, result) -> str:
+        """Extract the final reply text from a RunResult."""
+        if hasattr(result, 'final_output'):
+            output = result.final_output
+            
+            # Check if output is a dict (assistant message)
+            if isinstance(output, dict):
+                if 'content' in output:
+                    content = output['content']
+                    if isinstance(content, str) and '__DEDALUS_HANDOFF__' not in content:
+                        return content
+                return str(output)
+            
+            return output
+        
+        # Fallback: try to get from messages
+        if hasattr(result, 'messages') and result.messages:
+            self._log(f"  [Trying to extract from messages]")
+            last_msg = result.messages[-1]
+            if isinstance(last_msg, dict) and last_msg.get('role') == 'assistant':
+                return last_msg.get('content', str(last_msg))
+        
+        return _NO_RESPONSE
+
     def _build_instructions(self, active_urls: List[str]) -> str:
-        """Generate agent instructions reflecting current cache state."""
-        if active_urls:
+        """Generate agent instructions reflecting current cache state.
+
+        The result only depends on the *set* of active servers, so it is
+        memoized per ``frozenset`` (LRU) and servers are listed in sorted order.
+        """
+        key = frozenset(active_urls)
+        cached = self._instructions_cache.get(key)
+        if cached is not None:
+            self._instructions_cache.move_to_end(key)
+            return cached
+
+        if key:
             # Show servers with their capabilities AND keywords
-            server_info = []
-            for url in active_urls:
-                # Find server info in registry
-                for entry in self._config.registry:
-                    if entry["url"] == url:
-                        desc = entry.get('description', 'Unknown')
-                        keywords = entry.get('keywords', [])
-                        kw_str = f" (covers: {', '.join(keywords[:5])})" if keywords else ""
-                        server_info.append(f"  - {url}: {desc}{kw_str}")
-                        break
-            
+            server_info = [
+                self._server_info[url] for url in sorted(key) if url in self._server_info
+            ]
             if server_info:
                 status = f"CONNECTED SERVERS:\n" + "\n".join(server_info) + "\n\nIMPORTANT: These servers ONLY handle their specific capabilities. For ANY other capability, you MUST call discover_tools."
             else:
-                status = f"You have {len(active_urls)} tool server(s) connected."
+                status = f"You have {len(key)} tool server(s) connected."
         else:
             status = "You have NO tool servers connected yet."
-        return _AGENT_INSTRUCTIONS.format(cache_status=status)
+        instructions = _INSTRUCTIONS_PREFIX + status + _INSTRUCTIONS_SUFFIX
+
+        self._instructions_cache[key] = instructions
+        if len(self._instructions_cache) > _INSTRUCTIONS_CACHE_SIZE:
+            self._instructions_cache.popitem(last=False)
+        return instructions
 
     # ------------------------------------------------------------------
     # Observability
@@ -17,6 +17,12 @@ class HealthTracker:
         """Record a server failure."""
         self._failures[url] = time.monotonic()
 
+    def mark_unhealthy_many(self, urls: List[str]) -> None:
+        """Record a failure for several servers at once."""
+        now = time.monotonic()
+        for url in urls:
+            self._failures[url] = now
+
     def is_healthy(self, url: str) -> bool:
         """True if no recorded failure or cooldown has expired."""
         if url not in self._failures:
@@ -2,7 +2,8 @@
 
 from __future__ import annotations
 
-from typing import Dict, List
+from collections import deque
+from typing import Deque, Dict, List
 
 
 class ConversationHistory:
@@ -11,11 +12,15 @@ class ConversationHistory:
     Messages are stored as OpenAI-format dicts (``{"role": ..., "content": ...}``).
     When the turn count exceeds ``max_turns``, older turn-pairs are dropped
     from the front while keeping the conversation coherent.
+
+    Storage is a deque with a running user-message count, so appends,
+    rollbacks of the latest turn, and front trimming are O(1) per message.
     """
 
     def __init__(self, max_turns: int = 20):
         self._max_turns = max_turns
-        self._messages: List[Dict] = []
+        self._messages: Deque[Dict] = deque()
+        self._user_count = 0
 
     # ------------------------------------------------------------------
     # Public API
@@ -23,7 +28,9 @@ class ConversationHistory:
 
     def update(self, messages: List[Dict]) -> None:
         """Replace history with the messages from a RunResult, then trim."""
-        self._messages = list(messages)
+        self._messages.clear()
+        self._messages.extend(messages)
+        self._user_count = sum(1 for m in self._messages if m.get("role") == "user")
         self._trim()
 
     def get_messages(self) -> List[Dict]:
@@ -33,22 +40,24 @@ class ConversationHistory:
     def append_user(self, content: str) -> List[Dict]:
         """Append a user message and return the full message list for execution."""
         self._messages.append({"role": "user", "content": content})
+        self._user_count += 1
         return list(self._messages)
-    
+
     def rollback_last_user(self) -> None:
-        """Remove the last user message (used when a turn fails completely)."""
-        if not self._messages:
-            return
-        # Find and remove the last user message
-        for i in range(len(self._messages) - 1, -1, -1):
-            if self._messages[i].get("role") == "user":
-                self._messages.pop(i)
-                break
+        """Remove the trailing user message (used when a turn fails completely).
+
+        Only an unanswered user message at the tail is removed; earlier turns
+        are never spliced out, so the history stays a stable prefix of what
+        the provider has already seen.
+        """
+        if self._messages and self._messages[-1].get("role") == "user":
+            self._messages.pop()
+            self._user_count -= 1
 
     @property
     def turn_count(self) -> int:
         """Count user messages as a proxy for turns."""
-        return sum(1 for m in self._messages if m.get("role") == "user")
+        return self._user_count
 
     def __len__(self) -> int:
         return len(self._messages)
@@ -63,25 +72,24 @@ class ConversationHistory:
         Preserves system messages at the start. A 'turn' is a user message
         and everything until the next user message.
         """
-        if self.turn_count <= self._max_turns:
+        if self._user_count <= self._max_turns:
             return
 
-        excess = self.turn_count - self._max_turns
-
-        # Find turn boundaries (indices of user messages)
-        user_indices = [i for i, m in enumerate(self._messages) if m.get("role") == "user"]
+        excess = self._user_count - self._max_turns
 
-        if len(user_indices) <= excess:
+        if self._user_count <= excess:
             return  # safety guard
 
-        # Cut everything before the (excess)-th user message,
-        # but keep any leading system messages.
-        cut_at = user_indices[excess]
+        # Set aside leading system messages, pop whole turns off the front
+        # until the (excess)-th user message is at the head, then restore.
         system_prefix = []
-        for m in self._messages:
-            if m.get("role") == "system":
-                system_prefix.append(m)
-            else:
-                break
+        while self._messages and self._messages[0].get("role") == "system":
+            system_prefix.append(self._messages.popleft())
+
+        dropped = 0
+        while dropped < excess or self._messages[0].get("role") != "user":
+            if self._messages.popleft().get("role") == "user":
+                dropped += 1
+        self._user_count -= dropped
 
-        self._messages = system_prefix + self._messages[cut_at:]
\ No newline at end of file
+        self._messages.extendleft(reversed(system_prefix))
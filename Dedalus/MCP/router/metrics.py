@@ -3,10 +3,16 @@
 Tracks which MCP servers were *actually called* (not just discovered) per
 session.  On startup, reads the log to determine the most popular tools
 for cache preloading.
+
+Recording is in-memory only; usage is written out by ``flush_session`` (or
+``flush``, which does the file I/O on a worker thread). A session may flush
+several times, but each tool is written at most once per session, so counting
+log entries still counts sessions.
 """
 
 from __future__ import annotations
 
+import asyncio
 import json
 import time
 from collections import Counter
@@ -19,7 +25,11 @@ class UsageMetrics:
 
     def __init__(self, metrics_file: Path):
         self._path = metrics_file
-        self._session_tools: set[str] = set()
+        # Logging only: uses since the last flush, tools written this session
+        self._pending: Counter[str] = Counter()
+        self._logged: set[str] = set()
+        # Logged sessions plus every use in this process; never cleared
+        self._uses: Counter[str] = Counter()
 
     # ------------------------------------------------------------------
     # Session tracking
@@ -27,27 +37,62 @@ class UsageMetrics:
 
     def record_tool_use(self, url: str) -> None:
         """Record that a tool was actually invoked this session."""
-        self._session_tools.add(url)
+        self._pending[url] += 1
+        self._uses[url] += 1
+
+    def record_tool_use_many(self, urls: List[str]) -> None:
+        """Record several invoked tools at once."""
+        self._pending.update(urls)
+        self._uses.update(urls)
 
     def flush_session(self) -> None:
         """Write the current session's usage to the JSONL file."""
-        if not self._session_tools:
+        self._write_entry(self._take_pending())
+
+    async def flush(self) -> None:
+        """Like ``flush_session`` but keeps the file I/O off the event loop."""
+        tools = self._take_pending()
+        if tools:
+            await asyncio.to_thread(self._write_entry, tools)
+
+    def _take_pending(self) -> List[str]:
+        """Return the tools first used this session since the last flush.
+
+        Resets the pending uses; tools already logged this session are not
+        returned again.
+        """
+        tools = sorted(url for url in self._pending if url not in self._logged)
+        self._logged.update(tools)
+        self._pending.clear()
+        return tools
+
+    def _write_entry(self, tools: List[str]) -> None:
+        if not tools:
             return
         self._path.parent.mkdir(parents=True, exist_ok=True)
         entry = {
             "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
-            "tools_used": sorted(self._session_tools),
+            "tools_used": tools,
         }
         with open(self._path, "a", encoding="utf-8") as f:
             f.write(json.dumps(entry) + "\n")
-        self._session_tools.clear()
 
     # ------------------------------------------------------------------
     # Analytics
     # ------------------------------------------------------------------
 
+    def usage_count(self, url: str) -> int:
+        """How often a tool has been used (logged sessions + uses this process).
+
+        Unaffected by flushes.
+        """
+        return self._uses[url]
+
     def get_top_tools(self, n: int = 5) -> List[str]:
-        """Read the full log and return the top-N most frequently used tools."""
+        """Read the full log and return the top-N most frequently used tools.
+
+        Also seeds ``usage_count`` with the logged session counts.
+        """
         if not self._path.exists():
             return []
 
@@ -64,4 +109,5 @@ class UsageMetrics:
                 except json.JSONDecodeError:
                     continue
 
+        self._uses = counter + self._uses
         return [tool for tool, _ in counter.most_common(n)]
\ No newline at end of file
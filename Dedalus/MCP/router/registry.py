@@ -2,8 +2,18 @@
 
 from __future__ import annotations
 
+import asyncio
 from typing import Dict, List
 
+import numpy as np
+
+# Registry entries per embeddings request at startup
+_EMBED_BATCH_SIZE = 32
+
+# Query embeddings kept for reuse (discovery seed terms + recent queries)
+_QUERY_CACHE_SIZE = 256
+
+
 class ToolRegistry:
     """Embeds MCP registry descriptions and performs semantic search."""
 
@@ -22,6 +32,8 @@ class ToolRegistry:
         self._relative_score_cutoff = relative_score_cutoff
         self._debug = debug
         self._cache: List[Dict] = []
+        self._matrix = np.empty((0, 0), dtype=np.float32)  # row i embeds _cache[i]
+        self._query_vectors: Dict[str, List[float]] = {}
 
     @staticmethod
     def _build_embed_text(entry: Dict) -> str:
@@ -41,66 +53,100 @@ class ToolRegistry:
             parts.append(", ".join(kw) if isinstance(kw, list) else str(kw))
         return " | ".join(parts)
     
-    def cache_embeddings(self) -> int:
-        """Batch-embed all registry entries."""
+    async def cache_embeddings(self) -> int:
+        """Batch-embed all registry entries.
+
+        Entries are sent in chunks of ``_EMBED_BATCH_SIZE``; the chunks are
+        requested concurrently on worker threads (the Dedalus client is sync).
+        """
         if not self._registry:
             return 0
         texts = [self._build_embed_text(t) for t in self._registry]
-        
-        # Direct Dedalus call
-        response = self._dedalus.embeddings.create(
-            model="text-embedding-3-small",
-            input=texts,
-        )
-        vectors = [d.embedding for d in response.data]
+        batches = [
+            texts[i:i + _EMBED_BATCH_SIZE] for i in range(0, len(texts), _EMBED_BATCH_SIZE)
+        ]
+
+        responses = await asyncio.gather(*(
+            # Direct Dedalus call
+            asyncio.to_thread(
+                self._dedalus.embeddings.create,
+                model="text-embedding-3-small",
+                input=batch,
+            )
+            for batch in batches
+        ))
+        vectors = [d.embedding for response in responses for d in response.data]
         
         self._cache = [
             {
                 "url": self._registry[i]["url"],
                 "description": self._registry[i]["description"],
-                "embedding": vectors[i],
             }
             for i in range(len(self._registry))
         ]
+        # Unit-length rows: cosine similarity becomes a plain dot product
+        self._matrix = _normalize_rows(np.asarray(vectors, dtype=np.float32))
         return len(self._cache)
 
+    def warm_queries(self, queries: List[str]) -> int:
+        """Embed known search terms ahead of time in a single request."""
+        if not queries:
+            return 0
+        return len(self._embed_queries(queries))
+
+    def _embed_queries(self, queries: List[str]) -> List[List[float]]:
+        """Embed queries, reusing cached vectors and batching the rest into one call."""
+        found = {q: self._query_vectors[q] for q in queries if q in self._query_vectors}
+        missing = [q for q in dict.fromkeys(queries) if q not in found]
+        if missing:
+            # Direct Dedalus call
+            response = self._dedalus.embeddings.create(
+                model="text-embedding-3-small",
+                input=missing,
+            )
+            for query, d in zip(missing, response.data):
+                found[query] = d.embedding
+                if len(self._query_vectors) >= _QUERY_CACHE_SIZE:
+                    self._query_vectors.pop(next(iter(self._query_vectors)))
+                self._query_vectors[query] = d.embedding
+        return [found[q] for q in queries]
+
     def search(self, queries: List[str]) -> List[Dict]:
         """Semantic search across the registry."""
         if not queries or not self._cache:
             return []
 
-        # Direct Dedalus call
-        response = self._dedalus.embeddings.create(
-            model="text-embedding-3-small",
-            input=queries,
-        )
-        query_vectors = [d.embedding for d in response.data]
+        query_vectors = self._embed_queries(queries)
         matched: Dict[str, Dict] = {}
 
-        for query_text, q_vec in zip(queries, query_vectors):
-            scored = []
-            for tool in self._cache:
-                score = _cosine_similarity(q_vec, tool["embedding"])
-                if score >= self._similarity_threshold:
-                    if self._debug:
-                        print(f"  [🔍 Query '{query_text[:30]}...' matched {tool['url']} (score: {score:.3f})]")
-                    scored.append((tool, score))
-
-            if not scored:
-                continue
-
-            best = max(s for _, s in scored)
-            cutoff = best * self._relative_score_cutoff
-            if self._debug:
-                print(f"  [🔍 Query '{query_text[:30]}...' - max: {best:.3f}, cutoff: {cutoff:.3f}]")
-
-            for tool, score in scored:
-                if score >= cutoff and tool["url"] not in matched:
-                    matched[tool["url"]] = {
-                        "url": tool["url"],
-                        "description": tool["description"],
-                        "score": round(score, 4),
-                    }
+        # (num_queries, num_tools) cosine scores in a single matmul
+        scores = _normalize_rows(np.asarray(query_vectors, dtype=np.float32)) @ self._matrix.T
+
+        # Per query: tools above the threshold, then within the relative
+        # cutoff of that query's best score — all rows at once
+        above = scores >= self._similarity_threshold
+        has_match = above.any(axis=1)
+        best = np.where(above, scores, -np.inf).max(axis=1)
+        cutoff = np.where(has_match, best, 0.0) * self._relative_score_cutoff
+        keep = above & (scores >= cutoff[:, None])
+
+        if self._debug:
+            for q, query_text in enumerate(queries):
+                if not has_match[q]:
+                    continue
+                for i in np.flatnonzero(above[q]):
+                    print(f"  [🔍 Query '{query_text[:30]}...' matched {self._cache[i]['url']} (score: {scores[q, i]:.3f})]")
+                print(f"  [🔍 Query '{query_text[:30]}...' - max: {best[q]:.3f}, cutoff: {cutoff[q]:.3f}]")
+
+        # Row-major order: earlier queries claim a URL first
+        for q, i in zip(*np.nonzero(keep)):
+            tool = self._cache[i]
+            if tool["url"] not in matched:
+                matched[tool["url"]] = {
+                    "url": tool["url"],
+                    "description": tool["description"],
+                    "score": round(float(scores[q, i]), 4),
+                }
 
         return list(matched.values())
 
@@ -113,10 +159,13 @@ class ToolRegistry:
 # Helpers
 # ---------------------------------------------------------------------------
 
-def _cosine_similarity(v1: List[float], v2: List[float]) -> float:
-    dot = sum(a * b for a, b in zip(v1, v2))
-    norm1 = sum(a * a for a in v1) ** 0.5
-    norm2 = sum(b * b for b in v2) ** 0.5
-    if norm1 * norm2 == 0:
-        return 0.0
-    return dot / (norm1 * norm2)
\ No newline at end of file
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """Scale each row to unit L2 norm in place (all-zero rows stay zero).
+
+    ``matrix`` must be a freshly built, C-contiguous float array, e.g. from
+    ``np.asarray(vectors, dtype=np.float32)`` on a list.
+    """
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    matrix /= norms
+    return matrix
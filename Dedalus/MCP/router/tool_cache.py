@@ -1,21 +1,43 @@
-"""LRU cache for active MCP server URLs.
+"""CLOCK cache for active MCP server URLs.
 
-Keeps the most recently *used* servers connected. When capacity is exceeded,
-the least-recently-used server is evicted.
+Keeps recently *used* servers connected. This is the CLOCK (second-chance)
+approximation of LRU: a hit only sets a reference bit, and when capacity is
+exceeded the clock hand sweeps from the oldest entry, clearing set bits and
+evicting the first server that has not been used since the last sweep.
+
+With a ``value_fn`` the eviction is value-aware (v-LRU): the hand collects
+the oldest ~10% unreferenced servers (at least two) and evicts the one the
+function scores lowest, so rarely-but-reliably used servers survive a burst
+of one-off discoveries.
 """
 
 from __future__ import annotations
 
-from collections import OrderedDict
-from typing import List
+import math
+from collections import deque
+from typing import Callable, Deque, Dict, List
+
+# Share of the cache considered for value-aware eviction
+_CANDIDATE_FRACTION = 0.1
+
+
+class _Node:
+    __slots__ = ("url", "referenced", "dead")
+
+    def __init__(self, url: str):
+        self.url = url
+        self.referenced = False  # new nodes sit at the tail, last in line anyway
+        self.dead = False
 
 
 class ToolCache:
-    """Bounded LRU cache of MCP server URLs."""
+    """Bounded CLOCK cache of MCP server URLs."""
 
-    def __init__(self, max_size: int = 10):
+    def __init__(self, max_size: int = 10, value_fn: Callable[[str], float] | None = None):
         self._max_size = max_size
-        self._cache: OrderedDict[str, None] = OrderedDict()
+        self._value_fn = value_fn
+        self._nodes: Dict[str, _Node] = {}
+        self._ring: Deque[_Node] = deque()  # clock order; the hand is at the left
 
     # ------------------------------------------------------------------
     # Public API
@@ -23,27 +45,53 @@ class ToolCache:
 
     def add(self, url: str) -> str | None:
         """Add a URL (or refresh it). Returns an evicted URL, if any."""
+        node = self._nodes.get(url)
+        if node is not None:
+            node.referenced = True
+            return None
         evicted = None
-        if url in self._cache:
-            self._cache.move_to_end(url)
-        else:
-            if len(self._cache) >= self._max_size:
-                evicted, _ = self._cache.popitem(last=False)  # evict oldest
-            self._cache[url] = None
+        if len(self._nodes) >= self._max_size:
+            evicted = self._sweep()
+        node = _Node(url)
+        self._nodes[url] = node
+        self._ring.append(node)
         return evicted
 
     def touch(self, url: str) -> None:
-        """Mark a URL as recently used (move to end)."""
-        if url in self._cache:
-            self._cache.move_to_end(url)
+        """Mark a URL as recently used (sets its reference bit)."""
+        node = self._nodes.get(url)
+        if node is not None:
+            node.referenced = True
+
+    def touch_many(self, urls: List[str]) -> None:
+        """Mark several URLs as recently used in one pass."""
+        nodes = self._nodes
+        for url in urls:
+            node = nodes.get(url)
+            if node is not None:
+                node.referenced = True
 
     def evict(self, url: str) -> None:
         """Remove a specific URL from the cache."""
-        self._cache.pop(url, None)
+        node = self._nodes.pop(url, None)
+        if node is None:
+            return
+        node.dead = True  # the hand drops it when it gets there
+        if len(self._ring) > 2 * max(self._max_size, 1):
+            self._ring = deque(n for n in self._ring if not n.dead)
+
+    def evict_many(self, urls: List[str]) -> None:
+        """Remove several URLs from the cache."""
+        for url in urls:
+            node = self._nodes.pop(url, None)
+            if node is not None:
+                node.dead = True
+        if len(self._ring) > 2 * max(self._max_size, 1):
+            self._ring = deque(n for n in self._ring if not n.dead)
 
     def get_urls(self) -> List[str]:
         """Return all cached URLs (oldest first)."""
-        return list(self._cache.keys())
+        return [n.url for n in self._ring if not n.dead]
 
     def preload(self, urls: List[str]) -> None:
         """Bulk-add URLs from metrics (oldest first so latest end up at tail)."""
@@ -51,10 +99,49 @@ class ToolCache:
             self.add(url)
 
     def __len__(self) -> int:
-        return len(self._cache)
+        return len(self._nodes)
 
     def __contains__(self, url: str) -> bool:
-        return url in self._cache
+        return url in self._nodes
 
     def __repr__(self) -> str:
-        return f"ToolCache({list(self._cache.keys())})"
\ No newline at end of file
+        return f"ToolCache({self.get_urls()})"
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _sweep(self) -> str | None:
+        """Advance the clock hand and evict one URL.
+
+        Without ``value_fn`` this is plain CLOCK: the first unreferenced URL
+        goes. Otherwise the lowest-valued of the first few unreferenced URLs
+        goes and the rest keep their place at the front of the ring.
+        """
+        ring = self._ring
+        if self._value_fn is None:
+            want = 1
+        else:
+            want = max(2, math.ceil(len(self._nodes) * _CANDIDATE_FRACTION))
+        want = min(want, len(self._nodes))
+
+        candidates: List[_Node] = []
+        while ring and len(candidates) < want:
+            node = ring.popleft()
+            if node.dead:
+                continue
+            if node.referenced:
+                node.referenced = False
+                ring.append(node)
+                continue
+            candidates.append(node)
+        if not candidates:
+            return None
+
+        if len(candidates) == 1:
+            victim = candidates[0]
+        else:
+            victim = min(candidates, key=lambda n: self._value_fn(n.url))
+            ring.extendleft(reversed([n for n in candidates if n is not victim]))
+        del self._nodes[victim.url]
+        return victim.url
@@ -83,8 +83,9 @@ async def broadcast_log(message: str, log_type: str = "info"):
 class WebRouter(SmartRouter):
     """Extended router that broadcasts logs to WebSocket clients."""
     
-    def _log(self, msg: str) -> None:
+    def _log(self, fmt: str, *args) -> None:
         """Override to broadcast logs."""
+        msg = fmt % args if args else fmt
         super()._log(msg)
         # Extract log type from message
         if "🔍" in msg:
@@ -126,6 +127,13 @@ async def startup():
     print("✅ Router initialized")
 
 
+@app.on_event("shutdown")
+async def shutdown():
+    """Flush router usage metrics on exit."""
+    if router is not None:
+        await router.shutdown()
+
+
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
     """WebSocket endpoint for real-time communication."""
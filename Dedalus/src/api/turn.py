@@ -11,6 +11,8 @@ from .models import DebugInfo, TurnRequest, TurnResponse
 
 router = APIRouter()
 
+_END_REPLY_TEXT = "Got it — ending our conversation. Talk to you later!"
+
 
 @router.post("/turn", response_model=TurnResponse)
 async def turn(request: TurnRequest) -> TurnResponse:
@@ -29,19 +31,21 @@ async def turn(request: TurnRequest) -> TurnResponse:
     Returns:
         TurnResponse with session_id, reply_text, and debug info
     """
-    start_time = time.time()
+    start_ns = time.perf_counter_ns()
 
     # Get or create session
     session_id, _ = await session_store.get_or_create(request.session_id)
 
     # Check for end conversation
+    # Responses are built server-side from trusted values, so skip validation
     if check_end_conversation(request.user_text):
-        return TurnResponse(
+        return TurnResponse.model_construct(
             session_id=session_id,
-            reply_text="Got it — ending our conversation. Talk to you later!",
+            reply_text=_END_REPLY_TEXT,
             end_conversation=True,
-            debug=DebugInfo(
-                latency_ms=int((time.time() - start_time) * 1000),
+            debug=DebugInfo.model_construct(
+                tool_trace=[],
+                latency_ms=(time.perf_counter_ns() - start_ns) // 1_000_000,
                 mode="agent",
             ),
         )
@@ -49,13 +53,13 @@ async def turn(request: TurnRequest) -> TurnResponse:
     # Process through agent
     reply_text, tool_trace, mode = await agent.process_turn(session_id, request.user_text)
 
-    latency_ms = int((time.time() - start_time) * 1000)
+    latency_ms = (time.perf_counter_ns() - start_ns) // 1_000_000
 
-    return TurnResponse(
+    return TurnResponse.model_construct(
         session_id=session_id,
         reply_text=reply_text,
         end_conversation=False,
-        debug=DebugInfo(
+        debug=DebugInfo.model_construct(
             tool_trace=tool_trace,
             latency_ms=latency_ms,
             mode=mode,
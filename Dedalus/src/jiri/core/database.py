@@ -56,8 +56,11 @@ async def init_db() -> None:
         str(settings.database_url),
         echo=settings.debug,
         pool_pre_ping=True,  # Verify connections before use
-        pool_size=10,
-        max_overflow=20,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,  # Drop connections before server-side timeouts
+        pool_use_lifo=True,  # Reuse the warmest connection; idle extras can age out
     )
 
     _session_factory = async_sessionmaker(
@@ -101,6 +104,25 @@ async def get_session() -> AsyncGenerator[AsyncSession, None]:
         await session.close()
 
 
+@asynccontextmanager
+async def get_readonly_session() -> AsyncGenerator[AsyncSession, None]:
+    """Get an async database session for SELECT-only work.
+
+    Same as get_session() but never commits, saving the COMMIT round-trip;
+    the transaction is simply released when the session closes.
+
+    Usage:
+        async with get_readonly_session() as session:
+            result = await session.execute(query)
+    """
+    factory = get_session_factory()
+    session = factory()
+    try:
+        yield session
+    finally:
+        await session.close()
+
+
 async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
     """FastAPI dependency for database sessions.
 
@@ -1,13 +1,62 @@
 """MCP Discovery and Caching with Dedalus Marketplace Crawler."""
 
+import asyncio
 import json
+import time
+from collections import Counter, OrderedDict
 from datetime import datetime, timedelta
 from typing import Any
 
 import chromadb
 from chromadb.config import Settings
+from chromadb.utils import embedding_functions
 
 from jiri.core.config import get_settings
+from jiri.core.redis_client import get_redis
+
+# Max records per ChromaDB upsert call
+_UPSERT_BATCH_SIZE = 200
+
+# Query embeddings kept in memory (LRU)
+_EMBED_CACHE_SIZE = 512
+
+# Redis sorted set of slug -> usage count, shared by all replicas
+USAGE_KEY = "mcp:usage"
+
+# Semantic search budget; after repeated failures searches are skipped
+# (native MCPs returned) until the cooldown passes
+_QUERY_TIMEOUT_SECONDS = 0.15
+_BREAKER_THRESHOLD = 3
+_BREAKER_COOLDOWN_SECONDS = 30.0
+
+
+class _TTLCache:
+    """Small LRU cache whose entries also expire after a fixed TTL."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._data: OrderedDict[Any, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: Any) -> Any | None:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires, value = entry
+        if time.monotonic() >= expires:
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Any, value: Any) -> None:
+        self._data[key] = (time.monotonic() + self._ttl, value)
+        self._data.move_to_end(key)
+        if len(self._data) > self._maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        self._data.clear()
 
 
 class MCPDiscovery:
@@ -29,8 +78,22 @@ class MCPDiscovery:
             "meanerbeaver/dedalus-marketplace-crawler-ts",
         ]
 
-        # Usage counters (in-memory, should be persisted to DB)
-        self._usage_counts: dict[str, int] = {}
+        # Usage counters; in-memory fallback for when Redis is unavailable
+        self._usage_counts: Counter[str] = Counter()
+
+        # Lookup caches so repeated queries/slugs skip the ChromaDB round-trip
+        self._query_cache = _TTLCache(maxsize=1024, ttl=300)
+        self._info_cache = _TTLCache(maxsize=512, ttl=3600)
+
+        # Our own handle on the collection's embedding function
+        # (all-MiniLM-L6-v2, ONNX, run in-process either way) so inference
+        # can run on a worker thread and query embeddings can be reused
+        self._embedding_fn: embedding_functions.EmbeddingFunction | None = None
+        self._query_embeddings: OrderedDict[str, Any] = OrderedDict()
+
+        # Circuit breaker state for ChromaDB queries
+        self._query_failures = 0
+        self._breaker_open_until = 0.0
 
     async def connect(self):
         """Connect to ChromaDB."""
@@ -41,9 +104,11 @@ class MCPDiscovery:
                 port=settings.chroma_port,
                 settings=Settings(anonymized_telemetry=False),
             )
+            self._embedding_fn = embedding_functions.DefaultEmbeddingFunction()
             self._collection = self._chroma_client.get_or_create_collection(
                 name="mcp_registry",
                 metadata={"description": "MCP Server Registry with semantic search"},
+                embedding_function=self._embedding_fn,
             )
             print("✓ MCPDiscovery connected to ChromaDB")
         except Exception as e:
@@ -96,12 +161,17 @@ class MCPDiscovery:
             },
         ]
 
-        # Cache in ChromaDB
+        # Cache in ChromaDB, one upsert per batch rather than per MCP
         if self._collection:
-            for mcp in mcps:
+            for start in range(0, len(mcps), _UPSERT_BATCH_SIZE):
+                batch = mcps[start : start + _UPSERT_BATCH_SIZE]
+                documents = [f"{mcp['name']}: {mcp['description']}" for mcp in batch]
+                # ONNX inference is CPU-bound: keep it off the event loop
+                embeddings = await asyncio.to_thread(self._embedding_fn, documents)
                 self._collection.upsert(
-                    ids=[mcp["slug"]],
-                    documents=[f"{mcp['name']}: {mcp['description']}"],
+                    ids=[mcp["slug"] for mcp in batch],
+                    documents=documents,
+                    embeddings=embeddings,
                     metadatas=[
                         {
                             "slug": mcp["slug"],
@@ -109,9 +179,12 @@ class MCPDiscovery:
                             "category": mcp["category"],
                             "tools": json.dumps(mcp["tools"]),
                         }
+                        for mcp in batch
                     ],
                 )
 
+        self._query_cache.clear()
+        self._info_cache.clear()
         self._last_refresh = datetime.now()
         print(f"✓ Cached {len(mcps)} MCPs from marketplace")
         return mcps
@@ -122,55 +195,97 @@ class MCPDiscovery:
             # Fall back to native MCPs
             return self._native_mcps[:limit]
 
+        normalized = query.lower().strip()
+        key = (normalized, limit)
+        cached = self._query_cache.get(key)
+        if cached is not None:
+            return list(cached)
+
+        if time.monotonic() < self._breaker_open_until:
+            return self._native_mcps[:limit]
+
         try:
-            results = self._collection.query(
-                query_texts=[query],
-                n_results=limit,
+            embedding = await self._embed_query(normalized)
+            # HttpClient is sync: run it off the event loop, within budget
+            results = await asyncio.wait_for(
+                asyncio.to_thread(
+                    self._collection.query,
+                    query_embeddings=[embedding],
+                    n_results=limit,
+                ),
+                timeout=_QUERY_TIMEOUT_SECONDS,
             )
+            self._query_failures = 0
 
             if results["ids"] and results["ids"][0]:
                 slugs = results["ids"][0]
                 # Prioritize native MCPs
                 native_first = [s for s in slugs if s in self._native_mcps]
                 others = [s for s in slugs if s not in self._native_mcps]
-                return native_first + others
+                ranked = native_first + others
+                self._query_cache.set(key, ranked)
+                return list(ranked)
 
         except Exception as e:
-            print(f"Semantic search failed: {e}")
+            print(f"Semantic search failed: {e!r}")
+            self._query_failures += 1
+            if self._query_failures >= _BREAKER_THRESHOLD:
+                self._breaker_open_until = time.monotonic() + _BREAKER_COOLDOWN_SECONDS
+                self._query_failures = 0
+                print(f"Semantic search disabled for {_BREAKER_COOLDOWN_SECONDS:.0f}s")
 
         return self._native_mcps[:limit]
 
-    def get_warm_mcps(self, count: int = 5) -> list[str]:
+    async def _embed_query(self, normalized: str) -> Any:
+        """Embed a normalized query, reusing recent embeddings."""
+        embedding = self._query_embeddings.get(normalized)
+        if embedding is not None:
+            self._query_embeddings.move_to_end(normalized)
+            return embedding
+
+        embedding = (await asyncio.to_thread(self._embedding_fn, [normalized]))[0]
+        self._query_embeddings[normalized] = embedding
+        if len(self._query_embeddings) > _EMBED_CACHE_SIZE:
+            self._query_embeddings.popitem(last=False)
+        return embedding
+
+    async def get_warm_mcps(self, count: int = 5) -> list[str]:
         """Get the most frequently used MCPs (warm pool)."""
-        if not self._usage_counts:
-            return self._native_mcps[:count]
+        try:
+            slugs = await get_redis().zrevrange(USAGE_KEY, 0, count - 1)
+        except Exception:
+            slugs = [slug for slug, _ in self._usage_counts.most_common(count)]
 
-        sorted_mcps = sorted(
-            self._usage_counts.items(),
-            key=lambda x: x[1],
-            reverse=True,
-        )
-        return [slug for slug, _ in sorted_mcps[:count]]
+        return slugs or self._native_mcps[:count]
 
-    def record_usage(self, slug: str):
+    async def record_usage(self, slug: str):
         """Record MCP usage for ranking."""
-        self._usage_counts[slug] = self._usage_counts.get(slug, 0) + 1
+        try:
+            await get_redis().zincrby(USAGE_KEY, 1, slug)
+        except Exception:
+            self._usage_counts[slug] += 1
 
     async def get_mcp_info(self, slug: str) -> dict | None:
         """Get information about a specific MCP."""
         if not self._collection:
             return None
 
+        cached = self._info_cache.get(slug)
+        if cached is not None:
+            return dict(cached)
+
         try:
             result = self._collection.get(ids=[slug])
             if result["metadatas"]:
                 meta = result["metadatas"][0]
-                return {
+                info = {
                     "slug": meta["slug"],
                     "name": meta["name"],
                     "category": meta["category"],
                     "tools": json.loads(meta["tools"]),
                 }
+                self._info_cache.set(slug, info)
+                return dict(info)
         except Exception:
             pass
         return None
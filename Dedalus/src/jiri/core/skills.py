@@ -1,21 +1,50 @@
 """Skill registry for loading and managing agent skills."""
 
+import functools
+import json
 import os
 from pathlib import Path
 from typing import Dict, List, Optional
 
 import yaml
 
+try:  # libyaml bindings are much faster when available
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # pragma: no cover
+    from yaml import SafeLoader
+
+# Parsed skills keyed by SKILL.md path, reused while (mtime, size) match
+CACHE_FILENAME = ".skills_cache"
+
+
+def _split_frontmatter(text: str) -> tuple[str, int] | None:
+    """Return (frontmatter, body offset) for text starting with a '---' block."""
+    if not text.startswith("---"):
+        return None
+    end = text.find("---", 3)
+    if end == -1:
+        return None
+    return text[3:end], end + 3
+
 
 class Skill:
-    """Represents a loaded skill."""
+    """Represents a loaded skill.
+
+    The body is read from disk on first access to ``content``; the index
+    only needs name and description.
+    """
 
-    def __init__(self, name: str, description: str, content: str, path: Path):
+    def __init__(self, name: str, description: str, path: Path):
         self.name = name
         self.description = description
-        self.content = content
         self.path = path
 
+    @functools.cached_property
+    def content(self) -> str:
+        text = self.path.read_text(encoding="utf-8")
+        split = _split_frontmatter(text)
+        return text[split[1] :].strip() if split else text.strip()
+
 
 class SkillRegistry:
     """Registry for discovering and loading skills."""
@@ -31,40 +60,72 @@ class SkillRegistry:
             print(f"Warning: Skills directory not found at {skills_dir}")
             return
 
+        cache = self._read_cache()
+        fresh_cache: Dict[str, list] = {}
+
         # Walk through directories in skills_dir
         for item in skills_dir.iterdir():
             if item.is_dir():
                 skill_file = item / "SKILL.md"
                 if skill_file.exists():
-                    self._load_skill_from_file(skill_file)
+                    stat = skill_file.stat()
+                    key = str(skill_file)
+                    entry = cache.get(key)
+                    if entry and entry[:2] == [stat.st_mtime_ns, stat.st_size]:
+                        name, description = entry[2:4]
+                        self.skills[name] = Skill(name=name, description=description, path=skill_file)
+                        fresh_cache[key] = entry
+                        continue
+
+                    skill = self._load_skill_from_file(skill_file)
+                    if skill:
+                        fresh_cache[key] = [
+                            stat.st_mtime_ns,
+                            stat.st_size,
+                            skill.name,
+                            skill.description,
+                        ]
+
+        if fresh_cache != cache:
+            self._write_cache(fresh_cache)
 
         print(f"✓ Loaded {len(self.skills)} skills from {skills_dir}")
 
-    def _load_skill_from_file(self, file_path: Path):
+    def _read_cache(self) -> Dict[str, list]:
+        """Read the parsed-skill cache, or an empty one if missing/corrupt."""
+        try:
+            return json.loads((self.agent_dir / CACHE_FILENAME).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+
+    def _write_cache(self, cache: Dict[str, list]):
+        """Persist the parsed-skill cache (best effort)."""
+        try:
+            (self.agent_dir / CACHE_FILENAME).write_text(json.dumps(cache), encoding="utf-8")
+        except OSError as e:
+            print(f"  - Could not write skills cache: {e}")
+
+    def _load_skill_from_file(self, file_path: Path) -> Optional[Skill]:
         """Parse a SKILL.md file and register the skill."""
         try:
-            content = file_path.read_text(encoding="utf-8")
+            split = _split_frontmatter(file_path.read_text(encoding="utf-8"))
 
             # Check for YAML frontmatter
-            if content.startswith("---"):
-                parts = content.split("---", 2)
-                if len(parts) >= 3:
-                    frontmatter_raw = parts[1]
-                    body = parts[2].strip()
-
-                    try:
-                        metadata = yaml.safe_load(frontmatter_raw)
-                        name = metadata.get("name", file_path.parent.name)
-                        description = metadata.get("description", "")
-
-                        self.skills[name] = Skill(
-                            name=name, description=description, content=body, path=file_path
-                        )
-                    except yaml.YAMLError:
-                        print(f"  - Error parsing frontmatter for {file_path.name}")
+            if split:
+                try:
+                    metadata = yaml.load(split[0], Loader=SafeLoader)
+                    name = metadata.get("name", file_path.parent.name)
+                    description = metadata.get("description", "")
+
+                    skill = Skill(name=name, description=description, path=file_path)
+                    self.skills[name] = skill
+                    return skill
+                except yaml.YAMLError:
+                    print(f"  - Error parsing frontmatter for {file_path.name}")
 
         except Exception as e:
             print(f"  - Error loading skill {file_path}: {e}")
+        return None
 
     def get_skill(self, name: str) -> Optional[Skill]:
         """Get a specific skill by name."""
@@ -86,6 +147,7 @@ class SkillRegistry:
 
 
 # Global instance
+@functools.lru_cache(maxsize=1)
 def get_registry() -> SkillRegistry:
     """Get or create the global skill registry."""
     root_dir = Path(os.getcwd())
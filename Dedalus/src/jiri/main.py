@@ -13,12 +13,14 @@ from uuid import uuid4
 
 from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 from jiri.core.config import get_settings
 from jiri.core.database import close_db, init_db
 from jiri.core.logging import RequestLogger, logger, setup_logging
 from jiri.core.redis_client import close_redis, init_redis
 from jiri.routers import health, session, voice_turn
+from jiri.routers.voice_chat import close_tts_client
 from jiri.session import session_store
 
 
@@ -52,6 +54,7 @@ async def lifespan(_: FastAPI) -> AsyncGenerator[None, None]:
     # Shutdown
     logger.info("Shutting down Jiri backend...")
     await session_store.close()
+    await close_tts_client()
     await close_redis()
     await close_db()
     logger.info("Jiri backend stopped")
@@ -68,6 +71,7 @@ def create_app() -> FastAPI:
         docs_url="/docs" if settings.debug else None,
         redoc_url="/redoc" if settings.debug else None,
         lifespan=lifespan,
+        default_response_class=ORJSONResponse,
     )
 
     # CORS middleware for development
@@ -4,6 +4,11 @@ import re
 
 # Keywords that trigger end of conversation
 END_KEYWORDS = {"stop", "end", "goodbye", "cancel", "bye", "quit", "exit"}
+# Whole words only: a hyphen counts as part of the word, so "end-to-end"
+# or "stop-loss" do not end the conversation
+_END_RE = re.compile(
+    r"(?<![\w-])(?:" + "|".join(sorted(END_KEYWORDS)) + r")(?![\w-])", re.IGNORECASE
+)
 
 # Fallback responses for common intents
 FALLBACK_RESPONSES = {
@@ -31,8 +36,7 @@ FALLBACK_RESPONSES = {
 
 def check_end_conversation(text: str) -> bool:
     """Check if user wants to end the conversation."""
-    words = set(text.lower().split())
-    return bool(words & END_KEYWORDS)
+    return _END_RE.search(text) is not None
 
 
 def get_fallback_response(user_text: str) -> str:
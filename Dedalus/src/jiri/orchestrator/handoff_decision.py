@@ -1,6 +1,15 @@
 """Handoff decision logic for Siri-to-App transitions."""
 
+import re
 from typing import Optional
+from urllib.parse import urlencode
+
+
+def _trigger_regex(triggers: list[str]) -> re.Pattern:
+    r"""Compile triggers into ``\b(?:(phrase...)\b|(word...)\w*)``."""
+    phrases = "|".join(re.escape(t) for t in triggers if " " in t)
+    words = "|".join(re.escape(t) for t in triggers if " " not in t)
+    return re.compile(rf"\b(?:({phrases})\b|({words})\w*)")
 
 
 class HandoffDecision:
@@ -31,6 +40,23 @@ class HandoffDecision:
         "select from",
     ]
 
+    # Intents that always need the app
+    APP_INTENTS = frozenset({"book_ride", "make_purchase", "fill_form"})
+
+    # One word-bounded regex per category. Single-word triggers also match
+    # inflections ("booking", "ordered") but not other words that merely
+    # contain them ("information" does not hit "form")
+    _VISUAL_RE = _trigger_regex(VISUAL_TRIGGERS)
+    _COMPLEX_RE = _trigger_regex(COMPLEX_ACTIONS)
+
+    @staticmethod
+    def _find_trigger(text_lower: str, pattern: re.Pattern) -> Optional[str]:
+        """Return the matching trigger for one category, if any."""
+        match = pattern.search(text_lower)
+        if match is None:
+            return None
+        return match.group(1) or match.group(2)
+
     @staticmethod
     def should_handoff(user_text: str, intent: Optional[str] = None) -> tuple[bool, str]:
         """
@@ -46,19 +72,18 @@ class HandoffDecision:
         text_lower = user_text.lower()
 
         # Check for explicit visual request
-        for trigger in HandoffDecision.VISUAL_TRIGGERS:
-            if trigger in text_lower:
-                return True, f"Visual trigger detected: '{trigger}'"
+        trigger = HandoffDecision._find_trigger(text_lower, HandoffDecision._VISUAL_RE)
+        if trigger:
+            return True, f"Visual trigger detected: '{trigger}'"
 
         # Check for complex actions requiring UI
-        for action in HandoffDecision.COMPLEX_ACTIONS:
-            if action in text_lower:
-                return True, f"Complex action requires UI: '{action}'"
+        trigger = HandoffDecision._find_trigger(text_lower, HandoffDecision._COMPLEX_RE)
+        if trigger:
+            return True, f"Complex action requires UI: '{trigger}'"
 
         # Intent-based handoff
-        if intent:
-            if intent in ["book_ride", "make_purchase", "fill_form"]:
-                return True, f"Intent '{intent}' requires app interaction"
+        if intent in HandoffDecision.APP_INTENTS:
+            return True, f"Intent '{intent}' requires app interaction"
 
         return False, "Voice-only interaction sufficient"
 
@@ -74,11 +99,9 @@ class HandoffDecision:
         Returns:
             Deep link URL string
         """
-        base_url = f"jiri://continue?session_id={session_id}"
-
+        params = {"session_id": session_id}
         if context:
             # Add context parameters
-            for key, value in context.items():
-                base_url += f"&{key}={value}"
+            params.update(context)
 
-        return base_url
+        return f"jiri://continue?{urlencode(params, doseq=True, safe='/')}"
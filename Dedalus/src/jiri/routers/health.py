@@ -5,13 +5,14 @@ Provides:
 - Detailed readiness check with DB/Redis connectivity
 """
 
+import asyncio
 from typing import Any
 
 from fastapi import APIRouter, status
 from pydantic import BaseModel
 from sqlalchemy import text
 
-from jiri.core.database import get_session
+from jiri.core.database import get_readonly_session
 from jiri.core.logging import logger
 from jiri.core.redis_client import get_redis
 
@@ -47,29 +48,33 @@ async def health_check() -> HealthResponse:
 )
 async def readiness_check() -> HealthResponse:
     """Detailed readiness check with dependency status."""
-    checks: dict[str, Any] = {}
-    all_healthy = True
 
-    # Check database
-    try:
-        async with get_session() as session:
+    async def _check_db() -> dict[str, Any]:
+        async with get_readonly_session() as session:
             result = await session.execute(text("SELECT 1"))
             result.scalar()
-        checks["database"] = {"status": "ok", "type": "timescaledb"}
-    except Exception as e:
-        logger.error(f"Database health check failed: {e}")
-        checks["database"] = {"status": "error", "error": str(e)}
-        all_healthy = False
-
-    # Check Redis
-    try:
-        redis = get_redis()
-        await redis.ping()
-        checks["redis"] = {"status": "ok"}
-    except Exception as e:
-        logger.error(f"Redis health check failed: {e}")
-        checks["redis"] = {"status": "error", "error": str(e)}
-        all_healthy = False
+        return {"status": "ok", "type": "timescaledb"}
+
+    async def _check_redis() -> dict[str, Any]:
+        await get_redis().ping()
+        return {"status": "ok"}
+
+    # Probe dependencies concurrently so latency is max(db, redis), not the sum
+    db_res, redis_res = await asyncio.gather(_check_db(), _check_redis(), return_exceptions=True)
+
+    checks: dict[str, Any] = {}
+    all_healthy = True
+
+    for name, label, result in (
+        ("database", "Database", db_res),
+        ("redis", "Redis", redis_res),
+    ):
+        if isinstance(result, Exception):
+            logger.error(f"{label} health check failed: {result}")
+            checks[name] = {"status": "error", "error": str(result)}
+            all_healthy = False
+        else:
+            checks[name] = result
 
     return HealthResponse(
         status="ok" if all_healthy else "degraded",
@@ -39,13 +39,14 @@ async def get_session_history(session_id: str) -> SessionHistoryResponse:
     # Get history
     history = await session_store.get_history(session_id)
     
-    # Convert to response format
+    # Convert to response format; history comes from our own store, so skip
+    # re-validating every message
     messages = [
-        SessionMessage(role=msg["role"], content=msg["content"])
+        SessionMessage.model_construct(role=msg["role"], content=msg["content"], timestamp="")
         for msg in history
     ]
-    
-    return SessionHistoryResponse(
+
+    return SessionHistoryResponse.model_construct(
         session_id=session_id,
         messages=messages,
         created_at=session_data.created_at.isoformat() if hasattr(session_data, 'created_at') else "",
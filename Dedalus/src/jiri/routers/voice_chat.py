@@ -4,13 +4,17 @@ Handles voice chat using on-device transcription + LLM + TTS.
 Architecture: iOS STT (on-device) -> Text to Server -> LLM -> TTS -> Play
 """
 
+import asyncio
 import base64
 import os
 from typing import Optional
+from urllib.parse import quote
 
 import httpx
-from fastapi import APIRouter, File, Form, UploadFile, HTTPException
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import JSONResponse, ORJSONResponse, Response, StreamingResponse
 from pydantic import BaseModel, Field
+from starlette.background import BackgroundTask
 
 from jiri.core.logging import logger
 from jiri.session import session_store
@@ -22,6 +26,15 @@ router = APIRouter()
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
 OPENAI_BASE_URL = "https://api.openai.com/v1"
 
+# Latency budget for TTS; the reply is returned without audio past this
+TTS_TIMEOUT_SECONDS = float(os.getenv("TTS_TIMEOUT_SECONDS", "1.5"))
+
+EMPTY_INPUT_REPLY = "I didn't catch that. Could you please repeat?"
+
+# Budget for the URL-encoded X-Reply-Text header; proxies and servers often
+# cap the whole header block at 8 KB
+REPLY_HEADER_MAX_BYTES = 2048
+
 
 class VoiceChatResponse(BaseModel):
     """Response from voice chat endpoint."""
@@ -40,35 +53,85 @@ class TextChatRequest(BaseModel):
     session_id: str = ""
 
 
-async def generate_tts(text: str) -> bytes:
-    """Generate TTS audio using OpenAI."""
-    if not OPENAI_API_KEY:
-        logger.warning("OPENAI_API_KEY not configured, skipping TTS")
-        return b""
+# Shared TTS client so turns reuse pooled keep-alive connections
+_tts_client: httpx.AsyncClient | None = None
+
 
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        response = await client.post(
-            f"{OPENAI_BASE_URL}/audio/speech",
+def _get_tts_client() -> httpx.AsyncClient:
+    """Get the shared TTS HTTP client, creating it on first use."""
+    global _tts_client
+
+    if _tts_client is None:
+        _tts_client = httpx.AsyncClient(
+            base_url=OPENAI_BASE_URL,
+            timeout=30.0,
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=50),
             headers={
                 "Authorization": f"Bearer {OPENAI_API_KEY}",
                 "Content-Type": "application/json",
             },
-            json={
-                "model": "tts-1",
-                "input": text[:4096],  # TTS limit
-                "voice": "alloy",
-                "response_format": "mp3",
-            },
         )
+    return _tts_client
+
+
+async def close_tts_client() -> None:
+    """Close the shared TTS client.
+
+    Should be called on application shutdown.
+    """
+    global _tts_client
+
+    if _tts_client is not None:
+        await _tts_client.aclose()
+        _tts_client = None
+
+
+def _reply_header(text: str) -> tuple[str, bool]:
+    """URL-encode ``text`` for X-Reply-Text, cut to ``REPLY_HEADER_MAX_BYTES``.
+
+    Returns (header value, truncated). Truncation happens on a character
+    boundary, so the value always decodes cleanly.
+    """
+    encoded = quote(text)
+    if len(encoded) <= REPLY_HEADER_MAX_BYTES:
+        return encoded, False
+    parts: list[str] = []
+    size = 0
+    for char in text:
+        part = quote(char)
+        if size + len(part) > REPLY_HEADER_MAX_BYTES:
+            break
+        parts.append(part)
+        size += len(part)
+    return "".join(parts), True
+
+
+def _tts_payload(text: str) -> dict:
+    """Request body for the OpenAI speech endpoint."""
+    return {
+        "model": "tts-1",
+        "input": text[:4096],  # TTS limit
+        "voice": "alloy",
+        "response_format": "mp3",
+    }
+
+
+async def generate_tts(text: str) -> bytes:
+    """Generate TTS audio using OpenAI."""
+    if not OPENAI_API_KEY:
+        logger.warning("OPENAI_API_KEY not configured, skipping TTS")
+        return b""
 
-        if response.status_code != 200:
-            logger.error(f"TTS API error: {response.status_code} - {response.text}")
-            return b""
+    response = await _get_tts_client().post("/audio/speech", json=_tts_payload(text))
+
+    if response.status_code != 200:
+        logger.error(f"TTS API error: {response.status_code} - {response.text}")
+        return b""
 
-        return response.content
+    return response.content
 
 
-@router.post("/voice/text", response_model=VoiceChatResponse)
+@router.post("/voice/text", response_model=VoiceChatResponse, response_class=ORJSONResponse)
 async def voice_text_chat(request: TextChatRequest) -> VoiceChatResponse:
     """
     Process a voice chat turn with pre-transcribed text.
@@ -78,7 +141,7 @@ async def voice_text_chat(request: TextChatRequest) -> VoiceChatResponse:
 
     1. Receive transcribed text from iOS
     2. Get LLM response via Dedalus
-    3. Generate TTS audio (optional)
+    3. Generate TTS audio (optional, dropped if over TTS_TIMEOUT_SECONDS)
     4. Return reply + audio
     """
     text = request.text.strip()
@@ -90,7 +153,7 @@ async def voice_text_chat(request: TextChatRequest) -> VoiceChatResponse:
         return VoiceChatResponse(
             session_id=session_id or "",
             transcript="",
-            reply_text="I didn't catch that. Could you please repeat?",
+            reply_text=EMPTY_INPUT_REPLY,
             audio_base64=None,
         )
 
@@ -99,12 +162,14 @@ async def voice_text_chat(request: TextChatRequest) -> VoiceChatResponse:
     reply_text, _, _ = await agent.process_turn(sid, text)
     logger.info(f"Agent reply: {reply_text[:100]}...")
 
-    # Step 2: Generate TTS (optional, requires OPENAI_API_KEY)
+    # Step 2: Generate TTS (optional, requires OPENAI_API_KEY), within budget
     audio_base64 = None
     try:
-        tts_audio = await generate_tts(reply_text)
+        tts_audio = await asyncio.wait_for(generate_tts(reply_text), timeout=TTS_TIMEOUT_SECONDS)
         if tts_audio:
             audio_base64 = base64.b64encode(tts_audio).decode()
+    except asyncio.TimeoutError:
+        logger.warning(f"TTS exceeded {TTS_TIMEOUT_SECONDS}s, returning text only")
     except Exception as e:
         logger.error(f"TTS error: {e}")
 
@@ -116,21 +181,79 @@ async def voice_text_chat(request: TextChatRequest) -> VoiceChatResponse:
     )
 
 
-@router.post("/voice/chat", response_model=VoiceChatResponse)
-async def voice_chat_legacy(
-    audio: UploadFile = File(..., description="Audio file (deprecated, use /voice/text)"),
-    session_id: str = Form(default="", description="Session ID for continuity"),
-) -> VoiceChatResponse:
+@router.post("/voice/text/stream")
+async def voice_text_chat_stream(request: TextChatRequest) -> Response:
+    """
+    Same as /voice/text, but streams the TTS audio as raw MP3.
+
+    The reply text and session ID travel in the X-Reply-Text (URL-encoded)
+    and X-Session-Id headers, so the audio is neither buffered in full nor
+    base64-encoded. Returns 204 with the same headers when no audio is
+    available.
+
+    X-Reply-Text is capped at REPLY_HEADER_MAX_BYTES; a longer reply is cut
+    and flagged with ``X-Reply-Text-Truncated: 1``, and the full text is the
+    last assistant message in GET /session/{session_id}/history.
+    """
+    text = request.text.strip()
+    session_id = request.session_id
+
+    logger.info(f"Voice text stream: '{text[:50]}...', session: {session_id or 'new'}")
+
+    if not text:
+        sid, reply_text = session_id or "", EMPTY_INPUT_REPLY
+    else:
+        sid, _ = await session_store.get_or_create(session_id)
+        reply_text, _, _ = await agent.process_turn(sid, text)
+        logger.info(f"Agent reply: {reply_text[:100]}...")
+
+    reply_header, truncated = _reply_header(reply_text)
+    headers = {"X-Reply-Text": reply_header, "X-Session-Id": sid}
+    if truncated:
+        headers["X-Reply-Text-Truncated"] = "1"
+
+    if not text or not OPENAI_API_KEY:
+        return Response(status_code=204, headers=headers)
+
+    try:
+        client = _get_tts_client()
+        tts_request = client.build_request("POST", "/audio/speech", json=_tts_payload(reply_text))
+        tts_response = await client.send(tts_request, stream=True)
+    except Exception as e:
+        logger.error(f"TTS error: {e}")
+        return Response(status_code=204, headers=headers)
+
+    if tts_response.status_code != 200:
+        body = await tts_response.aread()
+        await tts_response.aclose()
+        logger.error(f"TTS API error: {tts_response.status_code} - {body[:200]!r}")
+        return Response(status_code=204, headers=headers)
+
+    return StreamingResponse(
+        tts_response.aiter_bytes(),
+        media_type="audio/mpeg",
+        headers=headers,
+        background=BackgroundTask(tts_response.aclose),
+    )
+
+
+@router.post("/voice/chat", status_code=410, response_model=VoiceChatResponse)
+async def voice_chat_legacy() -> JSONResponse:
     """
     Legacy endpoint for audio upload.
 
     DEPRECATED: Use /voice/text with on-device speech recognition instead.
-    This endpoint now returns an error directing to the new endpoint.
+    Returns 410 Gone without reading the request body, so stray uploads
+    are never spooled to disk.
     """
-    return VoiceChatResponse(
-        session_id=session_id,
-        transcript="",
-        reply_text="Please update your app. Audio upload is deprecated. Use on-device speech recognition.",
-        audio_base64=None,
-        error="Use /voice/text endpoint with on-device STT",
+    return JSONResponse(
+        status_code=410,
+        headers={"Location": "/voice/text"},
+        content=VoiceChatResponse(
+            session_id="",
+            transcript="",
+            reply_text="Please update your app. Audio upload is deprecated. Use on-device speech recognition.",
+            audio_base64=None,
+            error="Use /voice/text endpoint with on-device STT",
+        ).model_dump(),
     )
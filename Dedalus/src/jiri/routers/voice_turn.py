@@ -12,6 +12,7 @@ from pydantic import BaseModel, Field
 from jiri.core.logging import logger
 from jiri.session import session_store
 from jiri.orchestrator import agent, check_end_conversation
+from jiri.orchestrator.handoff_decision import HandoffDecision
 
 router = APIRouter()
 
@@ -78,11 +79,15 @@ async def turn(request: TurnRequest) -> TurnResponse:
     if request.meta.location:
         logger.info(f"📍 Location context: {request.meta.location}")
 
-    # Get or create session
-    session_id, _ = await session_store.get_or_create(request.session_id)
+    # Check for end conversation before any session or agent work; a known
+    # session doesn't need to be loaded just to say goodbye
+    end_conversation = check_end_conversation(request.user_text)
+    if end_conversation and request.session_id:
+        session_id = request.session_id
+    else:
+        session_id, _ = await session_store.get_or_create(request.session_id)
 
-    # Check for end conversation
-    if check_end_conversation(request.user_text):
+    if end_conversation:
         latency_ms = int((time.time() - start_time) * 1000)
         return TurnResponse(
             session_id=session_id,
@@ -91,15 +96,15 @@ async def turn(request: TurnRequest) -> TurnResponse:
             debug=DebugInfo(latency_ms=latency_ms, mode="agent"),
         )
 
+    # Classify handoff up front; it only depends on the user's text
+    should_handoff, handoff_reason = HandoffDecision.should_handoff(request.user_text)
+
     # Process through agent
     reply_text, tool_trace, mode = await agent.process_turn(session_id, request.user_text)
 
     # Check if we should handoff to app
-    from jiri.orchestrator.handoff_decision import HandoffDecision
-    
-    should_handoff, handoff_reason = HandoffDecision.should_handoff(request.user_text)
     deep_link = None
-    
+
     if should_handoff:
         deep_link = HandoffDecision.generate_deep_link(session_id)
         logger.info(f"🔗 Handoff triggered: {handoff_reason}")
@@ -1,7 +1,16 @@
-"""Redis-backed session store for multi-laptop consistency."""
+"""Redis-backed session store for multi-laptop consistency.
 
+Recently used sessions are also kept in a small in-process cache so a burst
+of turns in one dialog doesn't re-fetch the session from Redis every time.
+Each save publishes the session ID on a Redis channel and every other
+process drops its local copy when it sees it.
+"""
+
+import asyncio
 import os
+import time
 import uuid
+from collections import OrderedDict
 from datetime import datetime
 from typing import Optional
 
@@ -9,6 +18,9 @@ import redis.asyncio as redis
 
 from .models import Message, SessionData
 
+# Pub/sub channel carrying "<instance id>:<session id>" on every save
+INVALIDATION_CHANNEL = "session:invalidate"
+
 
 class SessionStore:
     """Redis-backed session storage with in-memory fallback."""
@@ -17,19 +29,32 @@ class SessionStore:
         self.redis_url = os.getenv("REDIS_URL", "redis://localhost:6379/0")
         self.ttl_seconds = int(os.getenv("SESSION_TTL_SECONDS", "3600"))
         self.max_history = int(os.getenv("MAX_HISTORY_LENGTH", "20"))
+        self.local_ttl_seconds = float(os.getenv("SESSION_LOCAL_TTL_SECONDS", "60"))
+        self.local_max_sessions = int(os.getenv("SESSION_LOCAL_MAX", "10000"))
         self._redis: Optional[redis.Redis] = None
         self._fallback: dict[str, SessionData] = {}
+        self._local: OrderedDict[str, tuple[float, SessionData]] = OrderedDict()
+        self._instance_id = uuid.uuid4().hex
+        self._invalidation_task: Optional[asyncio.Task] = None
 
     async def connect(self):
         """Initialize Redis connection."""
         try:
             self._redis = redis.from_url(self.redis_url, decode_responses=True)
             await self._redis.ping()
+            self._invalidation_task = asyncio.create_task(self._invalidation_loop())
         except Exception:
             self._redis = None
 
     async def close(self):
         """Close Redis connection."""
+        if self._invalidation_task:
+            self._invalidation_task.cancel()
+            try:
+                await self._invalidation_task
+            except asyncio.CancelledError:
+                pass
+            self._invalidation_task = None
         if self._redis:
             await self._redis.close()
 
@@ -76,23 +101,74 @@ class SessionStore:
         data = session.model_dump_json()
 
         if self._redis:
-            await self._redis.setex(key, self.ttl_seconds, data)
+            async with self._redis.pipeline(transaction=False) as pipe:
+                pipe.setex(key, self.ttl_seconds, data)
+                pipe.publish(INVALIDATION_CHANNEL, f"{self._instance_id}:{session.session_id}")
+                await pipe.execute()
+            self._cache_local(session)
         else:
             self._fallback[session.session_id] = session
 
     async def _load(self, session_id: str) -> Optional[SessionData]:
-        """Load session from Redis or fallback."""
+        """Load session from the local cache, Redis, or fallback."""
         key = f"session:{session_id}"
 
         if self._redis:
+            cached = self._get_local(session_id)
+            if cached is not None:
+                return cached
             data = await self._redis.get(key)
             if data:
-                return SessionData.model_validate_json(data)
+                session = SessionData.model_validate_json(data)
+                self._cache_local(session)
+                return self._copy(session)
         else:
             return self._fallback.get(session_id)
 
         return None
 
+    def _get_local(self, session_id: str) -> Optional[SessionData]:
+        """Return a copy of a locally cached session if still fresh."""
+        entry = self._local.get(session_id)
+        if entry is None:
+            return None
+        cached_at, session = entry
+        if time.monotonic() - cached_at >= self.local_ttl_seconds:
+            del self._local[session_id]
+            return None
+        self._local.move_to_end(session_id)
+        return self._copy(session)
+
+    def _cache_local(self, session: SessionData):
+        """Remember a session locally, evicting the least recently used."""
+        self._local[session.session_id] = (time.monotonic(), self._copy(session))
+        self._local.move_to_end(session.session_id)
+        if len(self._local) > self.local_max_sessions:
+            self._local.popitem(last=False)
+
+    @staticmethod
+    def _copy(session: SessionData) -> SessionData:
+        """Copy that callers can mutate without touching the cached one."""
+        return session.model_copy(update={"history": list(session.history)})
+
+    async def _invalidation_loop(self):
+        """Drop local copies of sessions saved by other processes."""
+        try:
+            async with self._redis.pubsub() as pubsub:
+                await pubsub.subscribe(INVALIDATION_CHANNEL)
+                async for message in pubsub.listen():
+                    if message.get("type") != "message":
+                        continue
+                    instance_id, _, session_id = message["data"].partition(":")
+                    if instance_id != self._instance_id:
+                        self._local.pop(session_id, None)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            # Without invalidations the local cache can't be trusted
+            self.local_ttl_seconds = 0
+            self._local.clear()
+
 
 # Global instance
 session_store = SessionStore()
@@ -33,6 +33,9 @@ class RouterConfig:
     # --- Metrics ---
     metrics_file: Path = field(default_factory=lambda: Path("data/usage_metrics.jsonl"))
 
+    # --- Embeddings cache ---
+    embeddings_cache_file: Path = field(default_factory=lambda: Path("data/embeddings_cache.npz"))
+
     # --- MCP Registry ---
     registry: List[Dict] = field(default_factory=list)
     
@@ -18,11 +18,16 @@ Flow per turn:
 
 from __future__ import annotations
 
+import asyncio
+import functools
+import re
 import sys
+import time
+from collections import OrderedDict
 from typing import AsyncIterator, Dict, List
 
 from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
-from langchain_core.tools import tool as langchain_tool
+from langchain_core.tools import StructuredTool
 from langchain_mcp_adapters.client import MultiServerMCPClient
 from langgraph.prebuilt import create_react_agent
 
@@ -64,6 +69,30 @@ RULES:
 - Be concise, friendly, and helpful.\
 """
 
+# Split once so building instructions is a plain concatenation, not a format pass
+_INSTRUCTIONS_PREFIX, _INSTRUCTIONS_SUFFIX = _AGENT_INSTRUCTIONS.split("{cache_status}", 1)
+
+# Distinct active-server sets whose instructions are kept
+_INSTRUCTIONS_CACHE_SIZE = 32
+
+_DISCOVER_TOOLS_DESCRIPTION = """\
+Search for MCP tool servers that can handle specific capabilities.
+
+Call this when you need external data but don't have a matching server.
+Use 2-3 descriptive search terms per capability.
+
+Examples:
+- discover_tools(queries=["weather", "forecast", "conditions"])
+- discover_tools(queries=["github", "repository", "code search"])
+- discover_tools(queries=["stock market", "financial data"])"""
+
+# OpenAI role → LangChain message class
+_ROLE_MAP = {
+    "system": SystemMessage,
+    "user": HumanMessage,
+    "assistant": AIMessage,
+}
+
 
 class SmartRouter:
     """Provider-agnostic agent router with LRU tool caching."""
@@ -83,27 +112,95 @@ class SmartRouter:
             config.registry,
             similarity_threshold=config.similarity_threshold,
             relative_score_cutoff=config.relative_score_cutoff,
+            cache_file=config.embeddings_cache_file,
             debug=config.debug,
         )
-        self._cache = ToolCache(max_size=config.max_cache_size)
-        self._health = HealthTracker(cooldown_seconds=config.health_cooldown_seconds)
         self._metrics = UsageMetrics(metrics_file=config.metrics_file)
+        self._cache = ToolCache(max_size=config.max_cache_size, value_fn=self._metrics.value_score)
+        self._health = HealthTracker(cooldown_seconds=config.health_cooldown_seconds)
         self._history = ConversationHistory(max_turns=config.max_history_turns)
-        
-        # Track tool discoveries (set per turn)
-        self._newly_discovered: List[str] = []
+
+        # URL → registry entry, so per-turn lookups are dict hits, not scans
+        self._registry_by_url: Dict[str, Dict] = {}
+        self._server_info: Dict[str, str] = {}  # URL → rendered instructions line
+        self._mcp_entry_by_url: Dict[str, tuple[str, Dict]] = {}  # URL → (key, connection)
+        self._instructions_cache: OrderedDict[frozenset, str] = OrderedDict()
+        self.refresh_registry_index()
+
+        # Track tool discoveries (set per turn); a dict is an ordered set
+        self._newly_discovered: Dict[str, None] = {}
+        self._discover_call_count = 0
+
+        # discover_tools as a LangChain tool, built once (schema inference
+        # is not free) and shared by every turn
+        self._discover_tool = StructuredTool.from_function(
+            self._discover_tools_impl,
+            coroutine=self._adiscover_tools_impl,
+            name="discover_tools",
+            description=_DISCOVER_TOOLS_DESCRIPTION,
+        )
+
+        # Connected MCP clients and their tools, per server URL. Kept across
+        # turns so each server is connected once, not once per turn; dropped
+        # when the server is evicted or marked unhealthy
+        self._client_pool: Dict[str, tuple[MultiServerMCPClient, list]] = {}
+
+        # Compiled ReAct graphs keyed by the identities of their tools; the
+        # graph holds its tools, so an id cannot be reused while cached
+        self._agent_cache: OrderedDict[frozenset, object] = OrderedDict()
+
+        # (messages list, its length, converted LangChain messages)
+        self._lc_history_memo: tuple[List[Dict], int, list] | None = None
     
-    def _log(self, msg: str) -> None:
-        """Print debug message to stderr if debug mode is enabled."""
+    def _log(self, fmt: str, *args) -> None:
+        """Print debug message to stderr if debug mode is enabled.
+
+        ``fmt`` is %-formatted with ``args`` only when debug is on, so
+        callers can pass large objects without paying for their repr.
+        """
         if self._config.debug:
-            print(msg, file=sys.stderr, flush=True)
+            print(fmt % args if args else fmt, file=sys.stderr, flush=True)
     
+    def refresh_registry_index(self) -> None:
+        """Rebuild the URL index after ``config.registry`` has changed."""
+        index: Dict[str, Dict] = {}
+        for entry in self._config.registry:
+            index.setdefault(entry["url"], entry)  # first entry wins
+        self._registry_by_url = index
+
+        self._mcp_entry_by_url = {url: _mcp_entry(url, entry) for url, entry in index.items()}
+
+        server_info: Dict[str, str] = {}
+        for url, entry in index.items():
+            name = entry.get('name', url)
+            desc = entry.get('description', '')
+            keywords = entry.get('keywords', [])
+            kw_str = f" [{', '.join(keywords[:5])}]" if keywords else ""
+            server_info[url] = f"  - {name}: {desc}{kw_str}"
+        self._server_info = server_info
+        self._instructions_cache.clear()
+        self._health.set_index(list(index))
+
     # ------------------------------------------------------------------
     # Tool Discovery
     # ------------------------------------------------------------------
     
     def _discover_tools_impl(self, queries: List[str]) -> str:
         """Internal implementation of discover_tools."""
+        refusal = self._check_discover_call(queries)
+        if refusal:
+            return refusal
+        return self._activate_discovered(self._registry.search(queries))
+
+    async def _adiscover_tools_impl(self, queries: List[str]) -> str:
+        """Async discover_tools, used when the agent runs asynchronously."""
+        refusal = self._check_discover_call(queries)
+        if refusal:
+            return refusal
+        return self._activate_discovered(await self._registry.asearch(queries))
+
+    def _check_discover_call(self, queries: List[str]) -> str | None:
+        """Count a discover_tools call; return a refusal if it should not search."""
         self._discover_call_count += 1
 
         # Once tools are found, stop immediately — no more searching
@@ -114,15 +211,20 @@ class SmartRouter:
         if self._discover_call_count > 5:
             return "No tools found after multiple attempts. Answer with your general knowledge."
 
-        self._log(f"  [🔍 discover_tools called with queries: {queries}]")
-        results = self._registry.search(queries)
+        self._log("  [🔍 discover_tools called with queries: %s]", queries)
+        return None
+
+    def _activate_discovered(self, results: List[Dict]) -> str:
+        """Add healthy search results to the tool cache and build the reply."""
         self._log(f"  [🔍 Found {len(results)} matching tools]")
         for r in results:
             url = r["url"]
             if self._health.is_healthy(url) and url not in self._newly_discovered:
-                self._newly_discovered.append(url)
+                self._newly_discovered[url] = None
+                self._metrics.record_hit(url)
                 evicted = self._cache.add(url)
                 if evicted:
+                    self._client_pool.pop(evicted, None)
                     self._log(f"  [Cache evicted: {evicted}]")
         if self._newly_discovered:
             descs = [f"- {r['description']}" for r in results]
@@ -139,16 +241,18 @@ class SmartRouter:
 
     async def initialize(self) -> None:
         """Startup: cache embeddings + preload popular tools."""
+        self.refresh_registry_index()
         print("Caching registry embeddings...")
-        count = self._registry.cache_embeddings()
+        count = await self._registry.acache_embeddings()
         print(f"Cached embeddings for {count} tool(s).")
 
         # Preload from historical usage
         top = self._metrics.get_top_tools(self._config.preload_count)
         if top:
             # Only preload tools still in the registry
-            registry_urls = {t["url"] for t in self._config.registry}
-            to_preload = [u for u in top if u in registry_urls]
+            to_preload = sorted(
+                (u for u in top if u in self._registry_by_url), key=self._metrics.value_score
+            )
             self._cache.preload(to_preload)
             if to_preload:
                 print(f"Preloaded {len(to_preload)} tool(s) from usage history: {', '.join(to_preload)}")
@@ -163,33 +267,54 @@ class SmartRouter:
 
     def _build_mcp_config(self, urls: List[str]) -> Dict:
         """Build MultiServerMCPClient config from registry URLs."""
-        config = {}
-        for url in urls:
-            # Find server info in registry
-            entry = None
-            for e in self._config.registry:
-                if e["url"] == url:
-                    entry = e
-                    break
-            
-            name = entry.get("name", url) if entry else url
-            transport = entry.get("transport", "http") if entry else "http"
-            
-            # Use a sanitised key name
-            key = name.replace(" ", "_").lower()
-
-            if transport == "stdio":
-                config[key] = {
-                    "command": entry.get("command", "python"),
-                    "args": entry.get("args", []),
-                    "transport": "stdio",
-                }
-            else:
-                config[key] = {
-                    "url": url,
-                    "transport": transport,
-                }
-        return config
+        entries = self._mcp_entry_by_url
+        return dict(entries[url] if url in entries else _mcp_entry(url, None) for url in urls)
+
+    async def _load_tools(self, urls: List[str]) -> list:
+        """Return MCP tools for ``urls`` from the client pool."""
+        await self._ensure_clients(urls)
+        pool = self._client_pool
+        return [t for url in urls for t in pool[url][1]]
+
+    async def _ensure_clients(self, urls: List[str]) -> None:
+        """Connect to the servers in ``urls`` that are not pooled yet
+        (concurrently, one client per server)."""
+        missing = [url for url in urls if url not in self._client_pool]
+        if missing:
+            await asyncio.gather(*(self._connect_one(url) for url in missing))
+
+    async def _connect_one(self, url: str) -> None:
+        """Connect to one MCP server, list its tools and pool the client."""
+        client = MultiServerMCPClient(self._build_mcp_config([url]))
+        start = time.perf_counter()
+        try:
+            tools = await client.get_tools()
+        except Exception as e:
+            # Name the server so _run_agent can attribute the failure
+            raise RuntimeError(f"MCP server {url} failed to load tools: {e}") from e
+        self._metrics.record_connect_latency(url, (time.perf_counter() - start) * 1000)
+        self._client_pool[url] = (client, tools)
+
+    def _drop_server(self, url: str) -> None:
+        """Mark a server unhealthy and forget its cache slot and client."""
+        self._health.mark_unhealthy(url)
+        self._cache.evict(url)
+        self._client_pool.pop(url, None)
+
+    def _get_agent(self, tools: list):
+        """Return a ReAct agent for ``tools``, reusing the compiled graph
+        when the same tool objects were used recently."""
+        key = frozenset(map(id, tools))
+        agent = self._agent_cache.get(key)
+        if agent is not None:
+            self._agent_cache.move_to_end(key)
+            return agent
+
+        agent = create_react_agent(self._model, tools)
+        self._agent_cache[key] = agent
+        if len(self._agent_cache) > self._config.max_cache_size:
+            self._agent_cache.popitem(last=False)
+        return agent
 
     # ------------------------------------------------------------------
     # Turn handling
@@ -199,64 +324,44 @@ class SmartRouter:
         """Process a single user turn. Returns the assistant response."""
 
         # Track discoveries at instance level to avoid closure issues
-        self._newly_discovered: List[str] = []
+        self._newly_discovered = {}
         self._discover_call_count = 0
 
-        # --- discover_tools as a LangChain tool ---
-        router_self = self  # capture for closure
-
-        @langchain_tool
-        def discover_tools(queries: list[str]) -> str:
-            """Search for MCP tool servers that can handle specific capabilities.
-            
-            Call this when you need external data but don't have a matching server.
-            Use 2-3 descriptive search terms per capability.
-            
-            Examples:
-            - discover_tools(queries=["weather", "forecast", "conditions"])
-            - discover_tools(queries=["github", "repository", "code search"])
-            - discover_tools(queries=["stock market", "financial data"])"""
-            return router_self._discover_tools_impl(queries)
-
-        # Build messages
-        messages = self._history.append_user(user_input)
-
-        # Active servers (healthy subset of cache)
-        cached_urls = self._cache.get_urls()
-        active_urls = self._health.filter_healthy(cached_urls)
-        
-        if cached_urls and not active_urls:
-            self._log(f"  [All {len(cached_urls)} cached servers are unhealthy - starting fresh]")
-        
-
-        # Build instructions
-        instructions = self._build_instructions(active_urls)
+        async with self._history.turn_scope(user_input) as messages:
+            # Active servers (healthy subset of cache)
+            cached_urls = self._cache.get_urls()
+            active_urls = self._health.filter_healthy(cached_urls)
 
-        # --- Run agent ---
-        response = await self._run_agent(
-            messages=messages,
-            active_urls=active_urls,
-            discover_tools=discover_tools,
-            instructions=instructions,
-        )
+            if cached_urls and not active_urls:
+                self._log(f"  [All {len(cached_urls)} cached servers are unhealthy - starting fresh]")
 
-        # --- Check if discovery happened → re-run with new servers ---
-        if self._newly_discovered:
-            self._log(f"  [Discovered {len(self._newly_discovered)} new tool(s): {', '.join(self._newly_discovered)}]")
-            active_urls = self._health.filter_healthy(self._cache.get_urls())
-            self._log(f"  [Re-running with {len(active_urls)} active servers: {active_urls}]")
+            # Build instructions
             instructions = self._build_instructions(active_urls)
-            
+
+            # --- Run agent ---
             response = await self._run_agent(
                 messages=messages,
                 active_urls=active_urls,
-                discover_tools=discover_tools,
                 instructions=instructions,
             )
-            self._log(f"  [Re-run completed successfully]")
 
-        # --- Post-run processing ---
-        self._post_run(response, active_urls)
+            # --- Check if discovery happened → re-run with new servers ---
+            if self._newly_discovered:
+                if self._config.debug:
+                    self._log(f"  [Discovered {len(self._newly_discovered)} new tool(s): {', '.join(self._newly_discovered)}]")
+                active_urls = self._health.filter_healthy(self._cache.get_urls())
+                self._log("  [Re-running with %d active servers: %s]", len(active_urls), active_urls)
+                instructions = self._build_instructions(active_urls)
+
+                response = await self._run_agent(
+                    messages=messages,
+                    active_urls=active_urls,
+                    instructions=instructions,
+                )
+                self._log(f"  [Re-run completed successfully]")
+
+            # --- Post-run processing ---
+            self._post_run(response, active_urls)
 
         # Extract final text from response
         return self._extract_response(response)
@@ -265,7 +370,6 @@ class SmartRouter:
         self,
         messages: List[Dict],
         active_urls: List[str],
-        discover_tools,
         instructions: str,
     ) -> dict:
         """Run the LangGraph ReAct agent with MCP tools.
@@ -276,24 +380,23 @@ class SmartRouter:
 
         while True:
             self._log(f"  [Running with {len(remaining_urls)} MCP servers, max_steps={self._config.max_steps}]")
-            if remaining_urls:
+            if remaining_urls and self._config.debug:
                 self._log(f"  [Active servers: {', '.join(remaining_urls)}]")
 
             lc_messages = self._to_langchain_messages(messages, instructions)
 
             try:
                 if remaining_urls:
-                    mcp_config = self._build_mcp_config(remaining_urls)
-                    self._log(f"  [MCP config: {mcp_config}]")
+                    if self._config.debug:
+                        self._log("  [MCP config: %s]", self._build_mcp_config(remaining_urls))
 
-                    mcp_client = MultiServerMCPClient(mcp_config)
-                    mcp_tools = await mcp_client.get_tools()
+                    mcp_tools = await self._load_tools(remaining_urls)
                     self._log(f"  [Loaded {len(mcp_tools)} MCP tools]")
 
-                    all_tools = list(mcp_tools) + [discover_tools]
-                    agent = create_react_agent(self._model, all_tools)
+                    all_tools = mcp_tools + [self._discover_tool]
+                    agent = self._get_agent(all_tools)
                 else:
-                    agent = create_react_agent(self._model, [discover_tools])
+                    agent = self._get_agent([self._discover_tool])
 
                 result = await agent.ainvoke(
                     {"messages": lc_messages},
@@ -306,35 +409,31 @@ class SmartRouter:
                 # Try to identify which server failed
                 error_str = str(e)
                 failed_url = None
+                url_re = _url_pattern(frozenset(remaining_urls)) if remaining_urls else None
 
                 if isinstance(e, BaseExceptionGroup):
                     for sub in e.exceptions:
                         self._log(f"  [❌ Sub-exception: {type(sub).__name__}: {sub}]")
-                        sub_str = str(sub)
                         # Find which URL is in the error
-                        for url in remaining_urls:
-                            if url in sub_str:
-                                failed_url = url
-                                break
+                        match = url_re.search(str(sub)) if url_re else None
+                        if match:
+                            failed_url = match.group()
 
-                if not failed_url:
-                    for url in remaining_urls:
-                        if url in error_str:
-                            failed_url = url
-                            break
+                if not failed_url and url_re:
+                    match = url_re.search(error_str)
+                    if match:
+                        failed_url = match.group()
 
                 if failed_url and len(remaining_urls) > 1:
                     # Remove the failing server and retry with the rest
                     self._log(f"  [⚠️ Server {failed_url} failed — removing and retrying with remaining servers]")
-                    self._health.mark_unhealthy(failed_url)
-                    self._cache.evict(failed_url)
+                    self._drop_server(failed_url)
                     remaining_urls.remove(failed_url)
                     continue  # retry the while loop
                 elif failed_url:
                     # Only server left failed — mark unhealthy, fall through to discover-only
                     self._log(f"  [⚠️ Server {failed_url} failed — falling back to discover-tools only]")
-                    self._health.mark_unhealthy(failed_url)
-                    self._cache.evict(failed_url)
+                    self._drop_server(failed_url)
                     remaining_urls.remove(failed_url)
                     continue  # will run with 0 servers (discover_tools only)
                 else:
@@ -342,9 +441,7 @@ class SmartRouter:
                     self._log(f"  [❌ Execution error: {e}]")
                     if self._newly_discovered:
                         for url in self._newly_discovered:
-                            self._health.mark_unhealthy(url)
-                            self._cache.evict(url)
-                    self._history.rollback_last_user()
+                            self._drop_server(url)
                     raise
 
     async def handle_turn_stream(self, user_input: str) -> AsyncIterator[str]:
@@ -354,103 +451,78 @@ class SmartRouter:
         Only the final execution run is streamed.
         """
         # Reset discoveries for this turn
-        self._newly_discovered: List[str] = []
+        self._newly_discovered = {}
         self._discover_call_count = 0
 
-        router_self = self
-
-        @langchain_tool
-        def discover_tools(queries: list[str]) -> str:
-            """Search for MCP tool servers that can handle specific capabilities.
-            
-            Call this when you need external data but don't have a matching server.
-            Use 2-3 descriptive search terms per capability.
-            
-            Examples:
-            - discover_tools(queries=["weather", "forecast", "conditions"])
-            - discover_tools(queries=["github", "repository", "code search"])
-            - discover_tools(queries=["stock market", "financial data"])"""
-            return router_self._discover_tools_impl(queries)
-
-        messages = self._history.append_user(user_input)
-        active_urls = self._health.filter_healthy(self._cache.get_urls())
-        instructions = self._build_instructions(active_urls)
-
-        # Probe run (non-streaming) — may trigger discovery
-        result = await self._run_agent(
-            messages=messages,
-            active_urls=active_urls,
-            discover_tools=discover_tools,
-            instructions=instructions,
-        )
-
-        if self._newly_discovered:
-            self._log(f"  [Discovered {len(self._newly_discovered)} new tool(s): {', '.join(self._newly_discovered)}]")
+        async with self._history.turn_scope(user_input) as messages:
             active_urls = self._health.filter_healthy(self._cache.get_urls())
             instructions = self._build_instructions(active_urls)
-            
-            # Build streaming config
-            lc_messages = self._to_langchain_messages(messages, instructions)
-            
-            if active_urls:
-                mcp_config = self._build_mcp_config(active_urls)
-                mcp_client = MultiServerMCPClient(mcp_config)
-                mcp_tools = await mcp_client.get_tools()
-                all_tools = list(mcp_tools) + [discover_tools]
-                agent = create_react_agent(self._model, all_tools)
-                
+
+            # Probe run (non-streaming) — may trigger discovery
+            result = await self._run_agent(
+                messages=messages,
+                active_urls=active_urls,
+                instructions=instructions,
+            )
+
+            if self._newly_discovered:
+                if self._config.debug:
+                    self._log(f"  [Discovered {len(self._newly_discovered)} new tool(s): {', '.join(self._newly_discovered)}]")
+                active_urls = self._health.filter_healthy(self._cache.get_urls())
+                instructions = self._build_instructions(active_urls)
+
+                # Build streaming config
+                lc_messages = self._to_langchain_messages(messages, instructions)
+
+                tools = [self._discover_tool]
+                if active_urls:
+                    tools = await self._load_tools(active_urls) + tools
+                agent = self._get_agent(tools)
+
                 collected: List[str] = []
                 async for event in agent.astream_events(
                     {"messages": lc_messages},
                     config={"recursion_limit": self._config.max_steps * 2},
                     version="v2",
                 ):
-                    if event["event"] == "on_chat_model_stream":
-                        chunk = event["data"]["chunk"]
-                        if hasattr(chunk, "content") and isinstance(chunk.content, str) and chunk.content:
-                            collected.append(chunk.content)
-                            yield chunk.content
+                    if event["event"] != "on_chat_model_stream":
+                        continue
+                    content = getattr(event["data"]["chunk"], "content", None)
+                    if content and isinstance(content, str):
+                        collected.append(content)
+                        yield content
+
+                # Update history from collected output
+                full_output = "".join(collected)
+                updated_msgs = messages + [{"role": "assistant", "content": full_output}]
+                self._history.update(updated_msgs)
             else:
-                agent = create_react_agent(self._model, [discover_tools])
-                collected: List[str] = []
-                async for event in agent.astream_events(
-                    {"messages": lc_messages},
-                    config={"recursion_limit": self._config.max_steps * 2},
-                    version="v2",
-                ):
-                    if event["event"] == "on_chat_model_stream":
-                        chunk = event["data"]["chunk"]
-                        if hasattr(chunk, "content") and isinstance(chunk.content, str) and chunk.content:
-                            collected.append(chunk.content)
-                            yield chunk.content
-
-            # Update history from collected output
-            full_output = "".join(collected)
-            updated_msgs = messages + [{"role": "assistant", "content": full_output}]
-            self._history.update(updated_msgs)
-        else:
-            # No discovery — yield the full result
-            output = self._extract_response(result)
-            yield output
-            self._post_run(result, active_urls)
+                # No discovery — yield the full result
+                output = self._extract_response(result)
+                yield output
+                self._post_run(result, active_urls)
 
     # ------------------------------------------------------------------
     # Message conversion
     # ------------------------------------------------------------------
 
     def _to_langchain_messages(self, messages: List[Dict], instructions: str) -> list:
-        """Convert OpenAI-format dicts to LangChain message objects."""
-        lc_messages = [SystemMessage(content=instructions)]
-        for msg in messages:
-            role = msg.get("role", "")
-            content = msg.get("content", "")
-            if role == "system":
-                lc_messages.append(SystemMessage(content=content))
-            elif role == "user":
-                lc_messages.append(HumanMessage(content=content))
-            elif role == "assistant":
-                lc_messages.append(AIMessage(content=content))
-        return lc_messages
+        """Convert OpenAI-format dicts to LangChain message objects.
+
+        The history part is memoized for the last ``messages`` list seen, so
+        retries and the post-discovery re-run of a turn skip the conversion.
+        """
+        memo = self._lc_history_memo
+        if memo is not None and memo[0] is messages and memo[1] == len(messages):
+            converted = memo[2]
+        else:
+            converted = [
+                _ROLE_MAP[m["role"]](content=m.get("content", ""))
+                for m in messages
+                if m.get("role") in _ROLE_MAP
+            ]
+            self._lc_history_memo = (messages, len(messages), converted)
+        return [SystemMessage(content=instructions), *converted]
 
     # ------------------------------------------------------------------
     # Internals
@@ -459,44 +531,43 @@ class SmartRouter:
     def _post_run(self, result: dict, active_urls: List[str]) -> None:
         """LRU touch, health tracking, metrics, history update."""
         response_messages = result.get("messages", [])
-        
-        # Check if any tool calls happened (indicates MCP tools were used)
+
+        # One pass: detect tool use/errors (tool calls indicate MCP tools were
+        # used) and convert LangChain messages back to dicts for history
         tool_was_used = False
         has_error = False
+        history_msgs = []
         for msg in response_messages:
             if isinstance(msg, ToolMessage):
                 tool_was_used = True
-                if hasattr(msg, "status") and msg.status == "error":
+                if getattr(msg, "status", None) == "error":
                     has_error = True
                     self._log(f"  [Tool error: {msg.content[:100]}]")
+            elif isinstance(msg, AIMessage):
+                if isinstance(msg.content, str) and msg.content:
+                    history_msgs.append({"role": "assistant", "content": msg.content})
+            elif isinstance(msg, HumanMessage):
+                history_msgs.append({"role": "user", "content": msg.content})
+            elif isinstance(msg, SystemMessage):
+                history_msgs.append({"role": "system", "content": msg.content})
 
-        # If tools were executed successfully, touch all active servers
-        if tool_was_used and not has_error:
-            for url in active_urls:
-                self._cache.touch(url)
-                self._metrics.record_tool_use(url)
-                self._log(f"  [✓ Server {url} used successfully]")
-
-        # Update conversation history
         if has_error:
             self._log(f"  [Skipping history update due to tool error]")
             for url in active_urls:
                 self._log(f"  [Marking {url} as unhealthy due to tool error]")
-                self._health.mark_unhealthy(url)
-                self._cache.evict(url)
+                self._drop_server(url)
             self._log(f"  [Rolling back failed user query from history to prevent contamination]")
             self._history.rollback_last_user()
-        else:
-            # Convert LangChain messages back to dict format for history
-            history_msgs = []
-            for msg in response_messages:
-                if isinstance(msg, HumanMessage):
-                    history_msgs.append({"role": "user", "content": msg.content})
-                elif isinstance(msg, AIMessage) and isinstance(msg.content, str) and msg.content:
-                    history_msgs.append({"role": "assistant", "content": msg.content})
-                elif isinstance(msg, SystemMessage):
-                    history_msgs.append({"role": "system", "content": msg.content})
-            self._history.update(history_msgs)
+            return
+
+        # If tools were executed successfully, touch all active servers
+        if tool_was_used:
+            for url in active_urls:
+                self._cache.touch(url)
+                self._metrics.record_tool_use(url)
+                self._log(f"  [✓ Server {url} used successfully]")
+
+        self._history.update(history_msgs)
 
     def _extract_response(self, result: dict) -> str:
         """Extract the final text response from a LangGraph result."""
@@ -510,19 +581,22 @@ class SmartRouter:
         return "No response generated"
 
     def _build_instructions(self, active_urls: List[str]) -> str:
-        """Generate agent instructions reflecting current cache state."""
+        """Generate agent instructions reflecting current cache state.
+
+        The result only depends on the *set* of active servers, so it is
+        memoized per set (servers are listed in sorted order).
+        """
+        key = frozenset(active_urls)
+        cached = self._instructions_cache.get(key)
+        if cached is not None:
+            self._instructions_cache.move_to_end(key)
+            return cached
+
         if active_urls:
-            server_info = []
-            for url in active_urls:
-                for entry in self._config.registry:
-                    if entry["url"] == url:
-                        name = entry.get('name', url)
-                        desc = entry.get('description', '')
-                        keywords = entry.get('keywords', [])
-                        kw_str = f" [{', '.join(keywords[:5])}]" if keywords else ""
-                        server_info.append(f"  - {name}: {desc}{kw_str}")
-                        break
-            
+            server_info = [
+                self._server_info[url] for url in sorted(key) if url in self._server_info
+            ]
+
             if server_info:
                 status = (
                     "YOUR TOOLS ARE ALREADY LOADED for these capabilities:\n"
@@ -532,10 +606,15 @@ class SmartRouter:
                     "Only call discover_tools if you need a capability NOT listed above."
                 )
             else:
-                status = f"You have {len(active_urls)} tool server(s) connected."
+                status = f"You have {len(key)} tool server(s) connected."
         else:
             status = "You have NO tool servers connected yet. Call discover_tools() to find tools."
-        return _AGENT_INSTRUCTIONS.format(cache_status=status)
+        instructions = _INSTRUCTIONS_PREFIX + status + _INSTRUCTIONS_SUFFIX
+
+        self._instructions_cache[key] = instructions
+        if len(self._instructions_cache) > _INSTRUCTIONS_CACHE_SIZE:
+            self._instructions_cache.popitem(last=False)
+        return instructions
 
     # ------------------------------------------------------------------
     # Observability
@@ -544,17 +623,44 @@ class SmartRouter:
     @property
     def cache_contents(self) -> List[Dict]:
         """Return cached servers with friendly names for the UI."""
-        urls = self._cache.get_urls()
         result = []
-        for url in urls:
-            name = url
-            for entry in self._config.registry:
-                if entry["url"] == url:
-                    name = entry.get("name", url)
-                    break
+        for url in self._cache.get_urls():
+            entry = self._registry_by_url.get(url)
+            name = entry.get("name", url) if entry else url
             result.append({"url": url, "name": name})
         return result
 
     @property
     def history_turns(self) -> int:
-        return self._history.turn_count
\ No newline at end of file
+        return self._history.turn_count
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def _mcp_entry(url: str, entry: Dict | None) -> tuple[str, Dict]:
+    """(sanitised key, connection config) for one server in MultiServerMCPClient."""
+    name = entry.get("name", url) if entry else url
+    transport = entry.get("transport", "http") if entry else "http"
+
+    # Use a sanitised key name
+    key = name.replace(" ", "_").lower()
+
+    if transport == "stdio":
+        return key, {
+            "command": entry.get("command", "python"),
+            "args": entry.get("args", []),
+            "transport": "stdio",
+        }
+    return key, {
+        "url": url,
+        "transport": transport,
+    }
+
+
+@functools.lru_cache(maxsize=32)
+def _url_pattern(urls: frozenset) -> re.Pattern:
+    """One regex matching any of ``urls`` (longest first, so a URL that
+    extends another is preferred)."""
+    return re.compile("|".join(re.escape(u) for u in sorted(urls, key=len, reverse=True)))
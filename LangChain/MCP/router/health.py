@@ -1,24 +1,64 @@
-"""MCP server health tracking with cooldown-based recovery."""
+"""MCP server health tracking with cooldown-based recovery.
+
+Registry URLs can be given stable slots (``set_index``); their state lives in
+one contiguous array of recovery times, so ``filter_healthy`` is a masked
+numpy compare instead of a dict lookup per URL. Other URLs use a dict.
+"""
 
 from __future__ import annotations
 
 import time
 from typing import Dict, List
 
+import numpy as np
+
 
 class HealthTracker:
     """Track unhealthy MCP servers and allow retry after cooldown."""
 
     def __init__(self, cooldown_seconds: int = 300):
         self._cooldown = cooldown_seconds
-        self._failures: Dict[str, float] = {}  # url -> timestamp of last failure
+        self._failures: Dict[str, float] = {}  # url -> timestamp of last failure (unindexed)
+        self._index: Dict[str, int] = {}  # url -> slot in _recover_at
+        self._recover_at = np.zeros(0, dtype=np.float64)  # monotonic time; 0 = healthy
+
+    def set_index(self, urls: List[str]) -> None:
+        """Give each URL a slot in the health array (e.g. all registry URLs).
+
+        Recorded failures carry over, whether or not the URL stays indexed.
+        """
+        now = time.monotonic()
+        pending = {
+            url: self._recover_at[i] for url, i in self._index.items() if self._recover_at[i] > now
+        }
+        pending.update(
+            (url, failed + self._cooldown) for url, failed in self._failures.items()
+        )
+
+        self._index = {url: i for i, url in enumerate(dict.fromkeys(urls))}
+        self._recover_at = np.zeros(len(self._index), dtype=np.float64)
+        self._failures = {}
+        for url, recover_at in pending.items():
+            i = self._index.get(url)
+            if i is not None:
+                self._recover_at[i] = recover_at
+            else:
+                self._failures[url] = recover_at - self._cooldown
 
     def mark_unhealthy(self, url: str) -> None:
         """Record a server failure."""
-        self._failures[url] = time.monotonic()
+        now = time.monotonic()
+        i = self._index.get(url)
+        if i is not None:
+            self._recover_at[i] = now + self._cooldown
+        else:
+            self._failures[url] = now
 
     def is_healthy(self, url: str) -> bool:
         """True if no recorded failure or cooldown has expired."""
+        i = self._index.get(url)
+        if i is not None:
+            return self._recover_at[i] <= time.monotonic()
         if url not in self._failures:
             return True
         elapsed = time.monotonic() - self._failures[url]
@@ -29,13 +69,29 @@ class HealthTracker:
 
     def filter_healthy(self, urls: List[str]) -> List[str]:
         """Return only healthy URLs from the list."""
-        healthy = [u for u in urls if self.is_healthy(u)]
-        unhealthy = [u for u in urls if not self.is_healthy(u)]
-        if unhealthy:
-            import sys
-            print(f"  [Health filter: {len(healthy)} healthy, {len(unhealthy)} unhealthy: {', '.join(unhealthy)}]", file=sys.stderr)
+        if not urls:
+            return []
+        index = self._index
+        slots = np.fromiter((index.get(u, -1) for u in urls), dtype=np.intp, count=len(urls))
+        indexed = slots >= 0
+        mask = np.ones(len(urls), dtype=bool)
+        mask[indexed] = self._recover_at[slots[indexed]] <= time.monotonic()
+        if self._failures:
+            for i in np.flatnonzero(~indexed):
+                mask[i] = self.is_healthy(urls[i])
+
+        if mask.all():
+            return list(urls)
+        healthy = [urls[i] for i in np.flatnonzero(mask)]
+        unhealthy = [urls[i] for i in np.flatnonzero(~mask)]
+        import sys
+        print(f"  [Health filter: {len(healthy)} healthy, {len(unhealthy)} unhealthy: {', '.join(unhealthy)}]", file=sys.stderr)
         return healthy
 
     def clear(self, url: str) -> None:
         """Manually clear a failure record (e.g. on successful use)."""
-        self._failures.pop(url, None)
\ No newline at end of file
+        i = self._index.get(url)
+        if i is not None:
+            self._recover_at[i] = 0.0
+        else:
+            self._failures.pop(url, None)
@@ -2,7 +2,8 @@
 
 from __future__ import annotations
 
-from typing import Dict, List
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List
 
 
 class ConversationHistory:
@@ -35,6 +36,21 @@ class ConversationHistory:
         self._messages.append({"role": "user", "content": content})
         return list(self._messages)
     
+    @asynccontextmanager
+    async def turn_scope(self, content: str) -> AsyncIterator[List[Dict]]:
+        """Append a user message for the duration of a turn.
+
+        Yields the message list for execution (as ``append_user``). If the
+        turn raises (or is cancelled), everything it added is rolled back.
+        """
+        mark = len(self._messages)
+        messages = self.append_user(content)
+        try:
+            yield messages
+        except BaseException:
+            del self._messages[mark:]
+            raise
+
     def rollback_last_user(self) -> None:
         """Remove the last user message (used when a turn fails completely)."""
         if not self._messages:
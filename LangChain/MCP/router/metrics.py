@@ -3,15 +3,23 @@
 Tracks which MCP servers were *actually called* (not just discovered) per
 session.  On startup, reads the log to determine the most popular tools
 for cache preloading.
+
+Also keeps per-server hit counts, last-use times and MCP connect latency,
+which ``value_score`` combines into the LCFU eviction score used by the
+tool cache.
 """
 
 from __future__ import annotations
 
 import json
+import math
 import time
 from collections import Counter
 from pathlib import Path
-from typing import List
+from typing import Dict, List
+
+# Assumed connect cost for servers that have not been timed yet
+_DEFAULT_CONNECT_MS = 500.0
 
 
 class UsageMetrics:
@@ -20,6 +28,11 @@ class UsageMetrics:
     def __init__(self, metrics_file: Path):
         self._path = metrics_file
         self._session_tools: set[str] = set()
+        self._hits: Counter[str] = Counter()  # logged sessions + this process
+        self._last_hit: Dict[str, float] = {}  # monotonic time of the last hit
+        self._connect_ms: Dict[str, float] = {}  # latest connect latency
+        # Servers never hit in this process age from startup
+        self._started = time.monotonic()
 
     # ------------------------------------------------------------------
     # Session tracking
@@ -28,6 +41,16 @@ class UsageMetrics:
     def record_tool_use(self, url: str) -> None:
         """Record that a tool was actually invoked this session."""
         self._session_tools.add(url)
+        self.record_hit(url)
+
+    def record_hit(self, url: str) -> None:
+        """Count an access to a cached (or newly cached) server."""
+        self._hits[url] += 1
+        self._last_hit[url] = time.monotonic()
+
+    def record_connect_latency(self, url: str, latency_ms: float) -> None:
+        """Record how long connecting to a server and listing its tools took."""
+        self._connect_ms[url] = latency_ms
 
     def flush_session(self) -> None:
         """Write the current session's usage to the JSONL file."""
@@ -38,6 +61,13 @@ class UsageMetrics:
             "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
             "tools_used": sorted(self._session_tools),
         }
+        connect_ms = {
+            url: round(self._connect_ms[url], 1)
+            for url in entry["tools_used"]
+            if url in self._connect_ms
+        }
+        if connect_ms:
+            entry["connect_ms"] = connect_ms
         with open(self._path, "a", encoding="utf-8") as f:
             f.write(json.dumps(entry) + "\n")
         self._session_tools.clear()
@@ -46,12 +76,29 @@ class UsageMetrics:
     # Analytics
     # ------------------------------------------------------------------
 
+    def value_score(self, url: str) -> float:
+        """LCFU value of keeping ``url`` connected (higher is worth more).
+
+        ``log(hits + 1) * log(connect_ms + 1) / (seconds since last hit + 1)``:
+        frequently used, slow-to-connect servers that were used recently
+        are the most expensive to drop. Servers not hit since startup
+        (e.g. preloaded from the log) age from startup.
+        """
+        latency = self._connect_ms.get(url, _DEFAULT_CONNECT_MS)
+        age = time.monotonic() - self._last_hit.get(url, self._started)
+        return math.log(self._hits[url] + 1) * math.log(latency + 1) / (age + 1)
+
     def get_top_tools(self, n: int = 5) -> List[str]:
-        """Read the full log and return the top-N most frequently used tools."""
+        """Read the full log and return the top-N most frequently used tools.
+
+        Also seeds hit counts, connect latencies and (with the startup time)
+        last-hit times for ``value_score``.
+        """
         if not self._path.exists():
             return []
 
         counter: Counter[str] = Counter()
+        logged_ms: Dict[str, float] = {}
         with open(self._path, "r", encoding="utf-8") as f:
             for line in f:
                 line = line.strip()
@@ -61,7 +108,12 @@ class UsageMetrics:
                     entry = json.loads(line)
                     for tool in entry.get("tools_used", []):
                         counter[tool] += 1
+                    logged_ms.update(entry.get("connect_ms", {}))  # newest reading wins
                 except json.JSONDecodeError:
                     continue
 
+        self._hits = counter + self._hits
+        self._connect_ms = {**logged_ms, **self._connect_ms}
+        for tool in counter:
+            self._last_hit.setdefault(tool, self._started)
         return [tool for tool, _ in counter.most_common(n)]
\ No newline at end of file
@@ -2,7 +2,20 @@
 
 from __future__ import annotations
 
-from typing import Dict, List
+import asyncio
+import hashlib
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Concurrent embeddings requests when caching the registry
+_EMBED_CONCURRENCY = 5
+
+# Registry rows scored per block; 128 x 1536-d float32 is ~768 KB, so a
+# dequantized block stays cache-resident while every query is scored on it
+_SCORE_TILE = 128
 
 
 class ToolRegistry:
@@ -15,14 +28,24 @@ class ToolRegistry:
         *,
         similarity_threshold: float = 0.25,
         relative_score_cutoff: float = 0.6,
+        cache_file: Optional[Path] = None,
         debug: bool = False,
     ):
         self._embeddings = embeddings
         self._registry = registry
+        self._cache_file = cache_file  # on-disk embeddings keyed by content hash
         self._similarity_threshold = similarity_threshold
         self._relative_score_cutoff = relative_score_cutoff
         self._debug = debug
-        self._cache: List[Dict] = []
+        # Parallel arrays, one slot per registry entry: scoring touches only
+        # the matrix, and strings are looked up for surviving matches
+        self._urls: List[str] = []
+        self._descriptions: List[str] = []
+        # Row i embeds entry i, scalar-quantized to int8 per dimension:
+        # value ≈ mins + (code + 128) * scales
+        self._codes = np.empty((0, 0), dtype=np.int8)
+        self._mins = np.empty(0, dtype=np.float32)
+        self._scales = np.empty(0, dtype=np.float32)
 
     @staticmethod
     def _build_embed_text(entry: Dict) -> str:
@@ -31,83 +54,204 @@ class ToolRegistry:
         Format: ``name | category | description | kw1, kw2, ...``
         Missing fields are simply omitted.
         """
-        parts: list[str] = []
-        if entry.get("name"):
-            parts.append(entry["name"])
-        if entry.get("category"):
-            parts.append(entry["category"])
-        parts.append(entry["description"])
-        if entry.get("keywords"):
-            kw = entry["keywords"]
-            parts.append(", ".join(kw) if isinstance(kw, list) else str(kw))
-        return " | ".join(parts)
+        kw = entry.get("keywords")
+        if kw:
+            kw = ", ".join(kw) if isinstance(kw, list) else str(kw)
+        return " | ".join(
+            filter(None, (entry.get("name"), entry.get("category"), entry["description"], kw))
+        )
     
     def cache_embeddings(self) -> int:
-        """Batch-embed all registry entries."""
+        """Batch-embed all registry entries.
+
+        Entries whose text is already in the on-disk cache are not re-embedded.
+        """
+        if not self._registry:
+            return 0
+        texts = [self._build_embed_text(t) for t in self._registry]
+        keys, rows, missing = self._lookup_cached(texts)
+
+        if missing:
+            vectors = self._embeddings.embed_documents([texts[i] for i in missing])
+            self._fill_missing(keys, rows, missing, vectors)
+        return self._store_vectors(rows)
+
+    async def acache_embeddings(self) -> int:
+        """Async ``cache_embeddings``.
+
+        The texts are split into the provider's request-sized chunks, and
+        up to ``_EMBED_CONCURRENCY`` chunks are embedded at once instead of
+        one after another.
+        """
         if not self._registry:
             return 0
         texts = [self._build_embed_text(t) for t in self._registry]
-        
-        vectors = self._embeddings.embed_documents(texts)
-        
-        self._cache = [
-            {
-                "url": self._registry[i]["url"],
-                "description": self._registry[i]["description"],
-                "embedding": vectors[i],
-            }
-            for i in range(len(self._registry))
+        keys, rows, missing = self._lookup_cached(texts)
+        if not missing:
+            return self._store_vectors(rows)
+
+        texts = [texts[i] for i in missing]
+        size = getattr(self._embeddings, "chunk_size", None) or len(texts)
+        semaphore = asyncio.Semaphore(_EMBED_CONCURRENCY)
+
+        async def embed(chunk: List[str]) -> List[List[float]]:
+            async with semaphore:
+                return await self._embeddings.aembed_documents(chunk)
+
+        chunks = await asyncio.gather(*(
+            embed(texts[i:i + size]) for i in range(0, len(texts), size)
+        ))
+        self._fill_missing(keys, rows, missing, [v for chunk in chunks for v in chunk])
+        return self._store_vectors(rows)
+
+    def _lookup_cached(self, texts: List[str]) -> Tuple[List[str], List, List[int]]:
+        """Content-hash each text and pull known vectors from the cache file.
+
+        Returns the keys, one row per text (``None`` where not cached) and
+        the indices still to embed.
+        """
+        model = getattr(self._embeddings, "model", "")
+        keys = [
+            hashlib.blake2b(f"{model}\n{text}".encode(), digest_size=8).hexdigest()
+            for text in texts
         ]
-        return len(self._cache)
+        cached = self._load_cache_file()
+        rows = [cached.get(key) for key in keys]
+        missing = [i for i, row in enumerate(rows) if row is None]
+        if self._debug:
+            print(f"  [Embeddings cache: {len(texts) - len(missing)} hit, {len(missing)} to embed]")
+        return keys, rows, missing
+
+    def _fill_missing(self, keys: List[str], rows: List, missing: List[int], vectors: List[List[float]]) -> None:
+        """Slot freshly embedded vectors into ``rows`` and persist the cache."""
+        for i, vector in zip(missing, vectors):
+            rows[i] = vector
+        self._save_cache_file(keys, rows)
+
+    def _load_cache_file(self) -> Dict[str, np.ndarray]:
+        if self._cache_file is None or not self._cache_file.exists():
+            return {}
+        try:
+            with np.load(self._cache_file) as data:
+                return dict(zip(data["keys"].tolist(), data["vectors"]))
+        except (OSError, ValueError, KeyError) as e:
+            print(f"  [Embeddings cache unreadable, re-embedding: {e}]")
+            return {}
+
+    def _save_cache_file(self, keys: List[str], rows: List) -> None:
+        """Write the current registry's vectors (float16) to the cache file.
+
+        Only current entries are kept, so stale texts drop out; the file is
+        replaced atomically.
+        """
+        if self._cache_file is None:
+            return
+        self._cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self._cache_file.with_name(self._cache_file.name + ".tmp")
+        with open(tmp, "wb") as f:
+            np.savez(f, keys=np.asarray(keys), vectors=np.asarray(rows, dtype=np.float16))
+        os.replace(tmp, self._cache_file)
+
+    def _store_vectors(self, vectors: List) -> int:
+        """Keep registry metadata and the quantized embedding matrix."""
+        self._urls = [entry["url"] for entry in self._registry]
+        self._descriptions = [entry["description"] for entry in self._registry]
+        # Unit-length rows: cosine similarity becomes a plain dot product
+        matrix = _normalize_rows(np.asarray(vectors, dtype=np.float32))
+        self._codes, self._mins, self._scales = _quantize_int8(matrix)
+        return len(self._urls)
 
     def search(self, queries: List[str]) -> List[Dict]:
         """Semantic search across the registry."""
-        if not queries or not self._cache:
+        if not queries or not self._urls:
+            return []
+
+        # One embeddings request for all queries
+        return self._match(queries, self._embeddings.embed_documents(queries))
+
+    async def asearch(self, queries: List[str]) -> List[Dict]:
+        """Async ``search``: embeds via ``aembed_documents`` (no worker thread)."""
+        if not queries or not self._urls:
             return []
 
-        query_vectors = [self._embeddings.embed_query(q) for q in queries]
+        return self._match(queries, await self._embeddings.aembed_documents(queries))
+
+    def _match(self, queries: List[str], query_vectors: List[List[float]]) -> List[Dict]:
+        """Score embedded queries against the registry and apply the cutoffs."""
         matched: Dict[str, Dict] = {}
 
-        for query_text, q_vec in zip(queries, query_vectors):
-            scored = []
-            for tool in self._cache:
-                score = _cosine_similarity(q_vec, tool["embedding"])
-                if score >= self._similarity_threshold:
-                    if self._debug:
-                        print(f"  [🔍 Query '{query_text[:30]}...' matched {tool['url']} (score: {score:.3f})]")
-                    scored.append((tool, score))
-
-            if not scored:
-                continue
-
-            best = max(s for _, s in scored)
-            cutoff = best * self._relative_score_cutoff
-            if self._debug:
-                print(f"  [🔍 Query '{query_text[:30]}...' - max: {best:.3f}, cutoff: {cutoff:.3f}]")
-
-            for tool, score in scored:
-                if score >= cutoff and tool["url"] not in matched:
-                    matched[tool["url"]] = {
-                        "url": tool["url"],
-                        "description": tool["description"],
-                        "score": round(score, 4),
-                    }
+        # (num_queries, num_tools) cosine scores in a single matmul
+        q = _normalize_rows(np.asarray(query_vectors, dtype=np.float32))
+        scores = _int8_scores(q, self._codes, self._mins, self._scales)
+
+        # Per query: tools above the threshold, then within the relative
+        # cutoff of that query's best score — all rows at once
+        above = scores >= self._similarity_threshold
+        has_match = above.any(axis=1)
+        best = np.where(above, scores, -np.inf).max(axis=1)
+        cutoff = np.where(has_match, best, 0.0) * self._relative_score_cutoff
+        keep = above & (scores >= cutoff[:, None])
+
+        if self._debug:
+            for q, query_text in enumerate(queries):
+                if not has_match[q]:
+                    continue
+                for i in np.flatnonzero(above[q]):
+                    print(f"  [🔍 Query '{query_text[:30]}...' matched {self._urls[i]} (score: {scores[q, i]:.3f})]")
+                print(f"  [🔍 Query '{query_text[:30]}...' - max: {best[q]:.3f}, cutoff: {cutoff[q]:.3f}]")
+
+        # Row-major order: earlier queries claim a URL first
+        for q, i in zip(*np.nonzero(keep)):
+            url = self._urls[i]
+            if url not in matched:
+                matched[url] = {
+                    "url": url,
+                    "description": self._descriptions[i],
+                    "score": round(float(scores[q, i]), 4),
+                }
 
         return list(matched.values())
 
     @property
     def tool_count(self) -> int:
-        return len(self._cache)
+        return len(self._urls)
 
 
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
 
-def _cosine_similarity(v1: List[float], v2: List[float]) -> float:
-    dot = sum(a * b for a, b in zip(v1, v2))
-    norm1 = sum(a * a for a in v1) ** 0.5
-    norm2 = sum(b * b for b in v2) ** 0.5
-    if norm1 * norm2 == 0:
-        return 0.0
-    return dot / (norm1 * norm2)
\ No newline at end of file
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """Scale each row to unit L2 norm (all-zero rows stay zero)."""
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return np.ascontiguousarray(matrix / norms)
+
+
+def _quantize_int8(matrix: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Scalar-quantize each column of ``matrix`` to int8 over its [min, max]."""
+    mins = matrix.min(axis=0)
+    scales = (matrix.max(axis=0) - mins) / 255.0
+    scales[scales == 0] = 1.0  # constant column: every code is -128
+    codes = np.rint((matrix - mins) / scales) - 128
+    return codes.astype(np.int8), mins.astype(np.float32), scales.astype(np.float32)
+
+
+def _int8_scores(
+    queries: np.ndarray, codes: np.ndarray, mins: np.ndarray, scales: np.ndarray
+) -> np.ndarray:
+    """Dot products of float32 ``queries`` with the dequantized rows of ``codes``.
+
+    Expands ``q · (mins + (c + 128) * scales)`` so the codes are never
+    dequantized: the scales fold into the query instead. Rows are scored
+    in blocks of ``_SCORE_TILE``, so only one block is widened to float32
+    at a time.
+    """
+    scaled = queries * scales
+    offset = queries @ mins + 128.0 * scaled.sum(axis=1)
+    out = np.empty((len(queries), len(codes)), dtype=np.float32)
+    for start in range(0, len(codes), _SCORE_TILE):
+        block = codes[start:start + _SCORE_TILE].astype(np.float32)
+        np.matmul(scaled, block.T, out=out[:, start:start + _SCORE_TILE])
+    out += offset[:, None]
+    return out
@@ -1,20 +1,22 @@
-"""LRU cache for active MCP server URLs.
+"""LRU / LCFU cache for active MCP server URLs.
 
 Keeps the most recently *used* servers connected. When capacity is exceeded,
-the least-recently-used server is evicted.
+the least-recently-used server is evicted, or, given a ``value_fn``, the
+server it scores lowest (least cost-efficient; ties go to the LRU one).
 """
 
 from __future__ import annotations
 
 from collections import OrderedDict
-from typing import List
+from typing import Callable, List
 
 
 class ToolCache:
     """Bounded LRU cache of MCP server URLs."""
 
-    def __init__(self, max_size: int = 10):
+    def __init__(self, max_size: int = 10, value_fn: Callable[[str], float] | None = None):
         self._max_size = max_size
+        self._value_fn = value_fn
         self._cache: OrderedDict[str, None] = OrderedDict()
 
     # ------------------------------------------------------------------
@@ -28,7 +30,8 @@ class ToolCache:
             self._cache.move_to_end(url)
         else:
             if len(self._cache) >= self._max_size:
-                evicted, _ = self._cache.popitem(last=False)  # evict oldest
+                evicted = self._pick_victim()
+                del self._cache[evicted]
             self._cache[url] = None
         return evicted
 
@@ -46,7 +49,8 @@ class ToolCache:
         return list(self._cache.keys())
 
     def preload(self, urls: List[str]) -> None:
-        """Bulk-add URLs from metrics (oldest first so latest end up at tail)."""
+        """Bulk-add URLs from metrics (least valuable first, so the most
+        valuable end up at the tail)."""
         for url in urls:
             self.add(url)
 
@@ -57,4 +61,14 @@ class ToolCache:
         return url in self._cache
 
     def __repr__(self) -> str:
-        return f"ToolCache({list(self._cache.keys())})"
\ No newline at end of file
+        return f"ToolCache({list(self._cache.keys())})"
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _pick_victim(self) -> str:
+        """URL to evict: the oldest, or the lowest-valued (oldest first on ties)."""
+        if self._value_fn is None:
+            return next(iter(self._cache))
+        return min(self._cache, key=self._value_fn)
@@ -3,9 +3,15 @@
 Run directly:  python servers/news_server.py
 """
 import os
+import threading
+import time
+from collections import OrderedDict
 from pathlib import Path
+
+import requests
 from dotenv import load_dotenv
 from mcp.server.fastmcp import FastMCP
+from newsapi import NewsApiClient
 
 load_dotenv(Path(__file__).resolve().parent.parent.parent / ".env", override=True)
 
@@ -13,6 +19,47 @@ mcp = FastMCP("news")
 
 NEWS_API_KEY = os.getenv("NEWS_API_KEY", "")
 
+# One client for the life of the server; its session keeps the connection
+# to newsapi.org alive between tool calls
+_NEWS = NewsApiClient(api_key=NEWS_API_KEY, session=requests.Session()) if NEWS_API_KEY else None
+
+# Recent results per (keyword, category, language, country), so repeated
+# questions within the TTL skip NewsAPI (and its quota)
+_CACHE_TTL_SECONDS = 60
+_CACHE_MAX_SIZE = 512
+_cache: OrderedDict[tuple, tuple[float, str]] = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _cache_get(key: tuple) -> str | None:
+    with _cache_lock:
+        entry = _cache.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() >= entry[0]:
+            del _cache[key]
+            return None
+        _cache.move_to_end(key)
+        return entry[1]
+
+
+def _cache_set(key: tuple, value: str) -> None:
+    with _cache_lock:
+        _cache[key] = (time.monotonic() + _CACHE_TTL_SECONDS, value)
+        _cache.move_to_end(key)
+        if len(_cache) > _CACHE_MAX_SIZE:
+            _cache.popitem(last=False)
+
+
+def _format_article(i: int, article: dict) -> str:
+    return (
+        f"{i}. {article.get('title', 'No title')}\n"
+        f"   Source: {article.get('source', {}).get('name', 'Unknown')}\n"
+        f"   Published: {article.get('publishedAt', 'Unknown date')}\n"
+        f"   URL: {article.get('url', 'No URL')}\n"
+        f"   Summary: {article.get('description', 'No description')}\n\n"
+    )
+
 
 @mcp.tool()
 def get_news(
@@ -22,12 +69,16 @@ def get_news(
     country: str = "us",
 ) -> str:
     """Get news articles about a specific keyword using NewsAPI."""
-    try:
-        from newsapi import NewsApiClient
+    if _NEWS is None:
+        return f"Error fetching news for '{keyword}': NEWS_API_KEY is not set"
 
-        newsapi = NewsApiClient(api_key=NEWS_API_KEY)
+    key = (keyword, category, language, country)
+    cached = _cache_get(key)
+    if cached is not None:
+        return cached
 
-        top_headlines = newsapi.get_top_headlines(
+    try:
+        top_headlines = _NEWS.get_top_headlines(
             q=keyword,
             category=category,
             language=language,
@@ -36,18 +87,13 @@ def get_news(
 
         if top_headlines["status"] == "ok" and top_headlines["articles"]:
             articles = top_headlines["articles"][:5]
-            formatted_news = f"News for '{keyword}':\n\n"
-
-            for i, article in enumerate(articles, 1):
-                formatted_news += f"{i}. {article.get('title', 'No title')}\n"
-                formatted_news += f"   Source: {article.get('source', {}).get('name', 'Unknown')}\n"
-                formatted_news += f"   Published: {article.get('publishedAt', 'Unknown date')}\n"
-                formatted_news += f"   URL: {article.get('url', 'No URL')}\n"
-                formatted_news += f"   Summary: {article.get('description', 'No description')}\n\n"
-
-            return formatted_news
+            result = f"News for '{keyword}':\n\n" + "".join(
+                _format_article(i, article) for i, article in enumerate(articles, 1)
+            )
         else:
-            return f"No news articles found for '{keyword}' in the {category} category."
+            result = f"No news articles found for '{keyword}' in the {category} category."
+        _cache_set(key, result)
+        return result
 
     except Exception as e:
         return f"Error fetching news for '{keyword}': {e}"
@@ -1,8 +1,10 @@
 """FastAPI web server for the MCP router with WebSocket support."""
 import os
+import re
+import json
 import asyncio
 from pathlib import Path
-from typing import List, Dict
+from typing import List
 
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from fastapi.staticfiles import StaticFiles
@@ -12,6 +14,15 @@ from langchain_openai import ChatOpenAI, OpenAIEmbeddings
 
 from router import SmartRouter, RouterConfig
 
+try:  # orjson serializes several times faster when available
+    from orjson import dumps as _orjson_dumps
+
+    def _json_dumps(obj) -> str:
+        return _orjson_dumps(obj).decode()
+except ImportError:  # pragma: no cover
+    def _json_dumps(obj) -> str:
+        return json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
+
 load_dotenv(Path(__file__).resolve().parent.parent / ".env", override=True)
 
 app = FastAPI()
@@ -59,17 +70,53 @@ MCP_REGISTRY = [
 ]
 
 
+# Log markers → UI log type; when several occur, the earliest listed wins
+_LOG_MARKERS = {
+    "🔍": "discovery",
+    "✓": "success",
+    "completed": "success",
+    "❌": "error",
+    "error": "error",
+    "⚠️": "warning",
+    "warning": "warning",
+}
+_LOG_MARKER_RE = re.compile("|".join(map(re.escape, _LOG_MARKERS)), re.IGNORECASE)
+_LOG_MARKER_RANK = {marker: rank for rank, marker in enumerate(_LOG_MARKERS)}
+
+
+def _classify_log(msg: str) -> str:
+    """Map a log line to its UI log type in one scan."""
+    found = _LOG_MARKER_RE.findall(msg)
+    if not found:
+        return "info"
+    return _LOG_MARKERS[min((m.lower() for m in found), key=_LOG_MARKER_RANK.__getitem__)]
+
+
 async def broadcast_log(message: str, log_type: str = "info"):
-    """Broadcast log message to all connected WebSocket clients."""
-    for connection in active_connections:
-        try:
-            await connection.send_json({
-                "type": "log",
-                "log_type": log_type,
-                "message": message
-            })
-        except:
-            pass
+    """Broadcast log message to all connected WebSocket clients.
+
+    The payload is encoded once and sent as text to every client; sends go
+    out concurrently, so one slow client does not delay the rest.
+    """
+    payload = _json_dumps({
+        "type": "log",
+        "log_type": log_type,
+        "message": message
+    })
+    await asyncio.gather(*(_safe_send(c, payload) for c in list(active_connections)))
+
+
+async def _safe_send(connection: WebSocket, payload: str) -> None:
+    """Send to one client, dropping it from the broadcast list if it is gone."""
+    try:
+        await connection.send_text(payload)
+    except Exception:
+        _drop_connection(connection)
+
+
+def _drop_connection(connection: WebSocket) -> None:
+    if connection in active_connections:
+        active_connections.remove(connection)
 
 
 class WebRouter(SmartRouter):
@@ -82,26 +129,19 @@ class WebRouter(SmartRouter):
     def set_loop(self, loop):
         self._loop = loop
     
-    def _log(self, msg: str) -> None:
+    def _log(self, fmt: str, *args) -> None:
         """Override to broadcast logs (thread-safe)."""
+        msg = fmt % args if args else fmt
         super()._log(msg)
-        # Extract log type from message
-        if "🔍" in msg:
-            log_type = "discovery"
-        elif "✓" in msg or "completed" in msg.lower():
-            log_type = "success"
-        elif "❌" in msg or "error" in msg.lower():
-            log_type = "error"
-        elif "⚠️" in msg or "warning" in msg.lower():
-            log_type = "warning"
-        else:
-            log_type = "info"
-        
+
+        # Headless / no UI clients: nothing to classify or schedule
+        if not active_connections or not (self._loop and self._loop.is_running()):
+            return
+
         # Broadcast — thread-safe
-        if self._loop and self._loop.is_running():
-            self._loop.call_soon_threadsafe(
-                asyncio.ensure_future, broadcast_log(msg, log_type)
-            )
+        self._loop.call_soon_threadsafe(
+            asyncio.ensure_future, broadcast_log(msg, _classify_log(msg))
+        )
 
 
 @app.on_event("startup")
@@ -180,7 +220,7 @@ async def websocket_endpoint(websocket: WebSocket):
                     })
                     
     except WebSocketDisconnect:
-        active_connections.remove(websocket)
+        _drop_connection(websocket)
 
 
 @app.get("/")
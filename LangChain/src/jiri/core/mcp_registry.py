@@ -3,7 +3,7 @@
 import os
 from typing import Optional
 
-from sqlalchemy import select
+from sqlalchemy import delete, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from jiri.core.models.mcp import MCPServer
@@ -70,13 +70,10 @@ class MCPRegistry:
 
     async def remove(self, slug: str) -> bool:
         """Remove an MCP server from the registry."""
-        result = await self.db.execute(select(MCPServer).where(MCPServer.slug == slug))
-        mcp = result.scalar_one_or_none()
-
-        if mcp:
-            await self.db.delete(mcp)
-            await self.db.commit()
+        result = await self.db.execute(delete(MCPServer).where(MCPServer.slug == slug))
+        await self.db.commit()
 
+        if result.rowcount:
             # Remove from ChromaDB
             if self.chroma:
                 try:
@@ -90,13 +87,15 @@ class MCPRegistry:
 
     async def list_active(self) -> list[MCPServer]:
         """List all active MCP servers."""
-        result = await self.db.execute(select(MCPServer).where(MCPServer.is_active == True))
+        result = await self.db.execute(select(MCPServer).where(MCPServer.is_active.is_(True)))
         return list(result.scalars().all())
 
     async def list_active_slugs(self) -> list[str]:
         """Get slugs of all active MCP servers for DedalusRunner."""
-        servers = await self.list_active()
-        return [s.slug for s in servers]
+        result = await self.db.execute(
+            select(MCPServer.slug).where(MCPServer.is_active.is_(True))
+        )
+        return list(result.scalars().all())
 
     async def get(self, slug: str) -> Optional[MCPServer]:
         """Get a specific MCP server by slug."""
@@ -105,12 +104,11 @@ class MCPRegistry:
 
     async def set_active(self, slug: str, active: bool) -> bool:
         """Enable or disable an MCP server."""
-        mcp = await self.get(slug)
-        if mcp:
-            mcp.is_active = active
-            await self.db.commit()
-            return True
-        return False
+        result = await self.db.execute(
+            update(MCPServer).where(MCPServer.slug == slug).values(is_active=active)
+        )
+        await self.db.commit()
+        return result.rowcount > 0
 
     def find_relevant_tools(self, query: str, n_results: int = 3) -> list[dict]:
         """
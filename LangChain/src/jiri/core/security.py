@@ -8,6 +8,8 @@ Implements Zero-Trust patterns:
 Following CODE_PATTERNS.md: Secrets injected at proxy level only.
 """
 
+import hmac
+from types import MappingProxyType
 from typing import Annotated
 
 from fastapi import Depends, HTTPException, Security, status
@@ -46,8 +48,8 @@ async def verify_api_key(
 
     settings = get_settings()
 
-    # In production, use constant-time comparison
-    if api_key != settings.api_key:
+    # Constant-time comparison, so response timing does not leak the key
+    if not hmac.compare_digest(api_key.encode(), settings.api_key.encode()):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Invalid API key",
@@ -77,15 +79,16 @@ class SecureHeaders:
     Adds security headers to responses following best practices.
     """
 
-    HEADERS = {
+    HEADERS = MappingProxyType({
         "X-Content-Type-Options": "nosniff",
         "X-Frame-Options": "DENY",
         "X-XSS-Protection": "1; mode=block",
         "Referrer-Policy": "strict-origin-when-cross-origin",
         "Cache-Control": "no-store",
-    }
+    })
 
     @classmethod
     def apply(cls, headers: dict[str, str]) -> dict[str, str]:
-        """Apply security headers to response headers dict."""
-        return {**headers, **cls.HEADERS}
+        """Apply security headers to response headers dict (in place)."""
+        headers.update(cls.HEADERS)
+        return headers
@@ -1,12 +1,21 @@
 """Local tool definitions and MCP server loader for Azure Voice Live."""
 
 import os
+import re
 import json
+from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
+from zoneinfo import ZoneInfo
 
 from azure.ai.voicelive.models import FunctionTool, MCPServer
 
+try:  # orjson parses several times faster when available
+    from orjson import loads as _json_loads
+except ImportError:  # pragma: no cover
+    _json_loads = json.loads
+
 
 # ============================================
 # Local Tool Definitions
@@ -48,16 +57,30 @@ TOOL_DEFINITIONS: list[FunctionTool] = [
 # Local Tool Handlers
 # ============================================
 
+# Only basic math operators and numbers
+_ALLOWED_RE = re.compile(r"[0-9+\-*/().%\s]+")
+
+
+@lru_cache(maxsize=64)
+def _tz(name: str) -> ZoneInfo:
+    """Timezone by IANA name (cached)."""
+    return ZoneInfo(name)
+
+
+@lru_cache(maxsize=256)
+def _safe_compile(expression: str):
+    """Compile an arithmetic expression, rejecting any names (no builtins, no imports)."""
+    code = compile(expression, "<string>", "eval")
+    if code.co_names:
+        raise ValueError(f"Forbidden name: {code.co_names[0]}")
+    return code
+
 
 def get_current_time(arguments: dict) -> str:
     """Get current time in specified timezone."""
-    from datetime import datetime
-    import pytz
-
     tz_name = arguments.get("timezone", "UTC")
     try:
-        tz = pytz.timezone(tz_name)
-        now = datetime.now(tz)
+        now = datetime.now(_tz(tz_name))
         return json.dumps(
             {
                 "time": now.strftime("%I:%M %p"),
@@ -74,17 +97,10 @@ def calculate(arguments: dict) -> str:
     expression = arguments.get("expression", "")
     try:
         # Use compile + restricted eval for safety
-        # Only allow basic math operators and numbers
-        allowed_chars = set("0123456789+-*/().% ")
-        if not all(c in allowed_chars for c in expression):
+        if not _ALLOWED_RE.fullmatch(expression):
             return json.dumps({"error": "Invalid characters in expression"})
 
-        # Compile to AST for safety check
-        code = compile(expression, "<string>", "eval")
-
-        # Check for forbidden names (no builtins, no imports)
-        for name in code.co_names:
-            return json.dumps({"error": f"Forbidden name: {name}"})
+        code = _safe_compile(expression)
 
         # Safe eval with no builtins
         result = eval(code, {"__builtins__": {}}, {})
@@ -113,21 +129,24 @@ def load_mcp_servers() -> list[MCPServer]:
         return []
 
     try:
-        with open(config_path) as f:
-            servers_config = json.load(f)
-
-        mcp_servers = []
-        for config in servers_config:
-            server = MCPServer(
-                server_label=config["server_label"],
-                server_url=config["server_url"],
-                require_approval=config.get("require_approval", "never"),
-                allowed_tools=config.get("allowed_tools"),
-            )
-            mcp_servers.append(server)
-            print(f"✓ Loaded MCP server: {config['server_label']}")
-
+        mcp_servers = list(_load_mcp_servers_cached(str(config_path)))
+        print(f"✓ Loaded {len(mcp_servers)} MCP server(s)")
         return mcp_servers
     except Exception as e:
         print(f"Error loading MCP servers: {e}")
         return []
+
+
+@lru_cache(maxsize=1)
+def _load_mcp_servers_cached(path: str) -> tuple[MCPServer, ...]:
+    """Parse a servers config file once per process."""
+    servers_config = _json_loads(Path(path).read_bytes())
+    return tuple(
+        MCPServer(
+            server_label=config["server_label"],
+            server_url=config["server_url"],
+            require_approval=config.get("require_approval", "never"),
+            allowed_tools=config.get("allowed_tools"),
+        )
+        for config in servers_config
+    )